@@ -1,16 +1,25 @@
 """The Aduro Hybrid Stove integration."""
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import ATTR_DEVICE_ID, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
 import voluptuous as vol
 
 from .const import (
+    ATTR_SERIAL,
     CONF_MQTT_BASE_PATH,
     CONF_MQTT_HOST,
     CONF_MQTT_PASSWORD,
@@ -20,6 +29,7 @@ from .const import (
     CONF_STOVE_SERIAL,
     DOMAIN,
     PLATFORMS,
+    SERVICE_GET_HISTORY,
     SERVICE_SET_HEATLEVEL,
     SERVICE_SET_OPERATION_MODE,
     SERVICE_SET_TEMPERATURE,
@@ -27,19 +37,33 @@ from .const import (
     SERVICE_STOP_STOVE,
 )
 from .coordinator import AduroDataUpdateCoordinator
+from .history import CHANNELS, HISTORY_TIERS
+from .hub import async_get_hub
 
 _LOGGER = logging.getLogger(__name__)
 
+# Every service can target stoves by device or serial
+STOVE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_SERIAL): cv.string,
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the Aduro Hybrid Stove component."""
     hass.data.setdefault(DOMAIN, {})
+    _async_register_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Aduro Hybrid Stove from a config entry."""
-    coordinator = AduroDataUpdateCoordinator(hass, entry)
+    hub = async_get_hub(hass)
+    coordinator = AduroDataUpdateCoordinator(hass, entry, hub)
+    await hub.async_load_history(coordinator)
+    await coordinator.pellets.async_load()
     
     await coordinator.async_config_entry_first_refresh()
     
@@ -49,63 +73,125 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
-    # Register services
-    await _async_register_services(hass, coordinator)
+    # Only fetch what the enabled entities read from now on
+    coordinator.async_update_required_fields()
+    
+    # The hub polls all stoves from one timer
+    hub.async_add(coordinator)
+    if coordinator.listener is not None:
+        coordinator.listener.async_start()
+    
+    # Reload when the options change so polling settings take effect
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry after its options were updated."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
     
     return unload_ok
 
 
-async def _async_register_services(
-    hass: HomeAssistant, coordinator: AduroDataUpdateCoordinator
-) -> None:
+def _async_get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[AduroDataUpdateCoordinator]:
+    """Return the stoves a service call targets.
+
+    Stoves are picked by device id or serial; without either the call goes
+    to the only configured stove.
+    """
+    hub = async_get_hub(hass)
+    device_ids = call.data.get(ATTR_DEVICE_ID, [])
+    serial = call.data.get(ATTR_SERIAL)
+    
+    if not device_ids and serial is None:
+        if len(hub.coordinators) != 1:
+            raise ServiceValidationError(
+                "Multiple stoves are configured, select a device or serial"
+            )
+        return list(hub.coordinators.values())
+    
+    coordinators = []
+    for device_id in device_ids:
+        if (coordinator := hub.async_get_coordinator(device_id=device_id)) is None:
+            raise ServiceValidationError(f"Device {device_id} is not an Aduro stove")
+        coordinators.append(coordinator)
+    if serial is not None:
+        if (coordinator := hub.async_get_coordinator(serial=serial)) is None:
+            raise ServiceValidationError(f"No stove with serial {serial} is configured")
+        coordinators.append(coordinator)
+    return coordinators
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
     """Register services for the integration."""
     
     async def handle_set_heatlevel(call: ServiceCall) -> None:
         """Handle the set heatlevel service."""
         heatlevel = call.data.get("heatlevel")
-        await coordinator.async_set_heatlevel(heatlevel)
+        for coordinator in _async_get_coordinators(hass, call):
+            await coordinator.async_set_heatlevel(heatlevel)
     
     async def handle_set_temperature(call: ServiceCall) -> None:
         """Handle the set temperature service."""
         temperature = call.data.get("temperature")
-        await coordinator.async_set_temperature(temperature)
+        for coordinator in _async_get_coordinators(hass, call):
+            await coordinator.async_set_temperature(temperature)
     
     async def handle_set_operation_mode(call: ServiceCall) -> None:
         """Handle the set operation mode service."""
         mode = call.data.get("mode")
-        await coordinator.async_set_operation_mode(mode)
+        for coordinator in _async_get_coordinators(hass, call):
+            await coordinator.async_set_operation_mode(mode)
     
     async def handle_start_stove(call: ServiceCall) -> None:
         """Handle the start stove service."""
-        await coordinator.async_start_stove()
+        for coordinator in _async_get_coordinators(hass, call):
+            await coordinator.async_start_stove()
     
     async def handle_stop_stove(call: ServiceCall) -> None:
         """Handle the stop stove service."""
-        await coordinator.async_stop_stove()
+        for coordinator in _async_get_coordinators(hass, call):
+            await coordinator.async_stop_stove()
+    
+    async def handle_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return the recorded status history per stove serial."""
+        end = dt_util.as_utc(call.data.get("end", dt_util.utcnow()))
+        start = dt_util.as_utc(call.data.get("start", end - timedelta(days=1)))
+        return {
+            coordinator.stove_serial: coordinator.history.query(
+                call.data["resolution"],
+                start.timestamp(),
+                end.timestamp(),
+                call.data.get("channels", CHANNELS),
+            )
+            for coordinator in _async_get_coordinators(hass, call)
+        }
     
     # Register service schemas
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_HEATLEVEL,
         handle_set_heatlevel,
-        schema=vol.Schema({vol.Required("heatlevel"): vol.In([1, 2, 3])}),
+        schema=STOVE_SCHEMA.extend({vol.Required("heatlevel"): vol.In([1, 2, 3])}),
     )
     
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_TEMPERATURE,
         handle_set_temperature,
-        schema=vol.Schema({
+        schema=STOVE_SCHEMA.extend({
             vol.Required("temperature"): vol.All(vol.Coerce(int), vol.Range(min=5, max=35))
         }),
     )
@@ -114,17 +200,34 @@ async def _async_register_services(
         DOMAIN,
         SERVICE_SET_OPERATION_MODE,
         handle_set_operation_mode,
-        schema=vol.Schema({vol.Required("mode"): vol.In([0, 1, 2])}),
+        schema=STOVE_SCHEMA.extend({vol.Required("mode"): vol.In([0, 1, 2])}),
     )
     
     hass.services.async_register(
         DOMAIN,
         SERVICE_START_STOVE,
         handle_start_stove,
+        schema=STOVE_SCHEMA,
     )
     
     hass.services.async_register(
         DOMAIN,
         SERVICE_STOP_STOVE,
         handle_stop_stove,
+        schema=STOVE_SCHEMA,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        handle_get_history,
+        schema=STOVE_SCHEMA.extend({
+            vol.Optional("resolution", default=HISTORY_TIERS[0].name): vol.In(
+                [tier.name for tier in HISTORY_TIERS]
+            ),
+            vol.Optional("start"): cv.datetime,
+            vol.Optional("end"): cv.datetime,
+            vol.Optional("channels"): vol.All(cv.ensure_list, [vol.In(CHANNELS)]),
+        }),
+        supports_response=SupportsResponse.ONLY,
     )
@@ -0,0 +1,80 @@
+"""Circuit breaker pausing the polls of an unreachable stove."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+
+
+class AduroCircuitBreaker:
+    """Count failed refreshes of one stove and open after too many in a row.
+
+    While open the coordinator only sends the small state probe, without
+    retries, every probe interval instead of the full poll; the first
+    answer closes the breaker again.
+    """
+
+    def __init__(self, serial: str, threshold: int, probe_interval: timedelta) -> None:
+        """Initialize the breaker."""
+        self.serial = serial
+        self.threshold = threshold
+        self.probe_interval = probe_interval
+        self.failures = 0
+        self.opened: datetime | None = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Return the state of the breaker."""
+        return BREAKER_CLOSED if self.opened is None else BREAKER_OPEN
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while the full poll is paused."""
+        return self.opened is not None
+
+    def record_success(self) -> bool:
+        """Record a refresh the stove answered, returning True if it closed."""
+        self.failures = 0
+        if self.opened is None:
+            return False
+        _LOGGER.info(
+            "Stove %s answers again after %s, resuming polls",
+            self.serial,
+            dt_util.now() - self.opened,
+        )
+        self.opened = None
+        return True
+
+    def record_failure(self) -> bool:
+        """Record a refresh the stove did not answer, returning True if it opened."""
+        self.failures += 1
+        if self.opened is not None or self.failures < self.threshold:
+            return False
+        _LOGGER.warning(
+            "Stove %s did not answer %d refreshes in a row, checking every %s until it does",
+            self.serial,
+            self.failures,
+            self.probe_interval,
+        )
+        self.opened = dt_util.now()
+        self.trips += 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "threshold": self.threshold,
+            "probe_interval": self.probe_interval.total_seconds(),
+            "opened": None if self.opened is None else self.opened.isoformat(),
+            "trips": self.trips,
+        }
@@ -7,10 +7,10 @@ from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import AduroDataUpdateCoordinator
+from .entity import AduroEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ async def async_setup_entry(
     ])
 
 
-class AduroRefilledButton(CoordinatorEntity[AduroDataUpdateCoordinator], ButtonEntity):
+class AduroRefilledButton(AduroEntity, ButtonEntity):
     """Button to mark stove as refilled."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -42,12 +42,12 @@ class AduroRefilledButton(CoordinatorEntity[AduroDataUpdateCoordinator], ButtonE
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        # Reset consumption counter
-        # This would typically be implemented via a service call or helper entity
+        self.coordinator.pellets.refill()
+        self.coordinator.async_update_listeners()
         _LOGGER.info("Stove marked as refilled")
 
 
-class AduroCleanedButton(CoordinatorEntity[AduroDataUpdateCoordinator], ButtonEntity):
+class AduroCleanedButton(AduroEntity, ButtonEntity):
     """Button to mark stove as cleaned."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -59,11 +59,12 @@ class AduroCleanedButton(CoordinatorEntity[AduroDataUpdateCoordinator], ButtonEn
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        # Reset refill counter
+        self.coordinator.pellets.clean()
+        self.coordinator.async_update_listeners()
         _LOGGER.info("Stove marked as cleaned")
 
 
-class AduroToggleModeButton(CoordinatorEntity[AduroDataUpdateCoordinator], ButtonEntity):
+class AduroToggleModeButton(AduroEntity, ButtonEntity):
     """Button to toggle between heat level and temperature mode."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -75,8 +76,8 @@ class AduroToggleModeButton(CoordinatorEntity[AduroDataUpdateCoordinator], Butto
     @property
     def icon(self) -> str:
         """Return the icon based on current mode."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            mode = self.coordinator.data["status"].get("regulation.operation_mode", 0)
+        if (status := self.coordinator.status) is not None:
+            mode = status.operation_mode or 0
             if mode == 0:
                 return "mdi:fire"
             elif mode == 1:
@@ -87,8 +88,8 @@ class AduroToggleModeButton(CoordinatorEntity[AduroDataUpdateCoordinator], Butto
 
     async def async_press(self) -> None:
         """Handle the button press - toggle between modes."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            current_mode = self.coordinator.data["status"].get("regulation.operation_mode", 0)
+        if (status := self.coordinator.status) is not None:
+            current_mode = status.operation_mode or 0
             # Toggle between heat level (0) and temperature (1) modes
             new_mode = 1 if current_mode == 0 else 0
             await self.coordinator.async_set_operation_mode(new_mode)
@@ -0,0 +1,112 @@
+"""Command queue coalescing control writes to an Aduro stove."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .const import DEFAULT_COMMAND_COALESCE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writes that cancel each other out; only the latest one is sent
+_EXCLUSIVE_PATHS = {
+    "misc.start": "misc.stop",
+    "misc.stop": "misc.start",
+}
+
+
+class AduroCommandQueue:
+    """Coalesce bursts of writes into one batch followed by one refresh.
+
+    Repeated writes to the same path within the coalescing window keep
+    only the latest value. Callers wait until their write, or the write
+    that superseded it, has been sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: Callable[[str, Any], Awaitable[Any]],
+        on_flushed: Callable[[], Awaitable[None]],
+        delay: float = DEFAULT_COMMAND_COALESCE_DELAY,
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._write = write
+        self._on_flushed = on_flushed
+        self._pending: dict[str, Any] = {}
+        self._waiters: dict[str, list[asyncio.Future[None]]] = {}
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=delay,
+            immediate=False,
+            function=self._async_flush,
+        )
+
+    async def async_enqueue(self, path: str, value: Any) -> None:
+        """Queue a write and wait until the batch containing it is sent."""
+        waiters = self._waiters.setdefault(path, [])
+        if (opposite := _EXCLUSIVE_PATHS.get(path)) in self._pending:
+            del self._pending[opposite]
+            waiters.extend(self._waiters.pop(opposite, []))
+
+        # Re-insert so the batch keeps the order of the latest writes
+        self._pending.pop(path, None)
+        self._pending[path] = value
+
+        future = self.hass.loop.create_future()
+        waiters.append(future)
+        await self._debouncer.async_call()
+        await future
+
+    async def _async_flush(self) -> None:
+        """Send the surviving writes, then request one refresh per batch.
+
+        The debouncer ignores calls while this runs, so writes queued
+        during a batch or its refresh are sent as the next batch here.
+        """
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, {}
+
+            _LOGGER.debug(
+                "Sending %d coalesced write(s) for %d request(s): %s",
+                len(pending),
+                sum(len(futures) for futures in waiters.values()),
+                pending,
+            )
+            for path, value in pending.items():
+                try:
+                    await self._write(path, value)
+                except Exception as err:  # pylint: disable=broad-except
+                    _resolve(waiters.get(path, []), err)
+                else:
+                    _resolve(waiters.get(path, []))
+
+            await self._on_flushed()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending flush and fail queued writes."""
+        self._debouncer.async_shutdown()
+        for futures in self._waiters.values():
+            _resolve(futures, asyncio.CancelledError())
+        self._pending.clear()
+        self._waiters.clear()
+
+
+def _resolve(futures: list[asyncio.Future[None]], err: BaseException | None = None) -> None:
+    """Complete the futures of the callers waiting on one write."""
+    for future in futures:
+        if future.done():
+            continue
+        if err is None:
+            future.set_result(None)
+        else:
+            future.set_exception(err)
@@ -13,17 +13,39 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.const import CONF_NAME
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_COMMAND_BOOST_DURATION,
+    CONF_DEADBAND_PREFIX,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_IGNITION_SCAN_INTERVAL,
+    CONF_MAX_IN_FLIGHT,
     CONF_MQTT_BASE_PATH,
     CONF_MQTT_HOST,
     CONF_MQTT_PASSWORD,
     CONF_MQTT_PORT,
     CONF_MQTT_USERNAME,
+    CONF_PARALLEL_FETCH,
+    CONF_PUSH_INTERVAL,
+    CONF_PUSH_MODE,
+    CONF_SCAN_INTERVAL,
     CONF_STOVE_PIN,
     CONF_STOVE_SERIAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_COMMAND_BOOST_DURATION,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_IGNITION_SCAN_INTERVAL,
+    DEFAULT_MAX_IN_FLIGHT,
     DEFAULT_MQTT_BASE_PATH,
     DEFAULT_MQTT_PORT,
+    DEFAULT_PARALLEL_FETCH,
+    DEFAULT_PUSH_INTERVAL,
+    DEFAULT_PUSH_MODE,
+    DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENTITY_DEADBANDS,
 )
+from .discovery import async_get_discovery_cache
+from .transport import AduroTransport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,15 +67,15 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
+    # A stove discovered recently needs no new broadcast
+    cache = async_get_discovery_cache(hass)
+    if await cache.async_get(data[CONF_STOVE_SERIAL]) is not None:
+        return {"title": f"Aduro Stove {data[CONF_STOVE_SERIAL]}"}
+    
     # Test connection by trying to discover the stove
+    transport = AduroTransport()
     try:
-        from pyduro.actions import discover
-        
-        def test_discover():
-            response = discover.run()
-            return response.parse_payload()
-        
-        result = await hass.async_add_executor_job(test_discover)
+        result = await transport.async_discover(serial=data[CONF_STOVE_SERIAL])
         
         if not result:
             raise CannotConnect
@@ -61,6 +83,11 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     except Exception as e:
         _LOGGER.error("Failed to validate connection: %s", e)
         raise CannotConnect
+    finally:
+        await transport.async_close()
+    
+    # Remember the address so the first refresh can skip discovery
+    await cache.async_save(result)
     
     # Return info to be stored in the config entry
     return {"title": f"Aduro Stove {data[CONF_STOVE_SERIAL]}"}
@@ -115,6 +142,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -139,6 +167,61 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_MQTT_BASE_PATH,
                         default=self.config_entry.data.get(CONF_MQTT_BASE_PATH, DEFAULT_MQTT_BASE_PATH),
                     ): str,
+                    vol.Optional(
+                        CONF_PARALLEL_FETCH,
+                        default=options.get(CONF_PARALLEL_FETCH, DEFAULT_PARALLEL_FETCH),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MAX_IN_FLIGHT,
+                        default=options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+                    ): bool,
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_SCAN_INTERVAL, int(DEFAULT_SCAN_INTERVAL.total_seconds())
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(
+                        CONF_IGNITION_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_IGNITION_SCAN_INTERVAL,
+                            int(DEFAULT_IGNITION_SCAN_INTERVAL.total_seconds()),
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=2, max=60)),
+                    vol.Optional(
+                        CONF_IDLE_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_IDLE_SCAN_INTERVAL, int(DEFAULT_IDLE_SCAN_INTERVAL.total_seconds())
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                    vol.Optional(
+                        CONF_COMMAND_BOOST_DURATION,
+                        default=options.get(
+                            CONF_COMMAND_BOOST_DURATION,
+                            int(DEFAULT_COMMAND_BOOST_DURATION.total_seconds()),
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                    vol.Optional(
+                        CONF_PUSH_MODE,
+                        default=options.get(CONF_PUSH_MODE, DEFAULT_PUSH_MODE),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PUSH_INTERVAL,
+                        default=options.get(
+                            CONF_PUSH_INTERVAL, int(DEFAULT_PUSH_INTERVAL.total_seconds())
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                    **{
+                        vol.Optional(
+                            f"{CONF_DEADBAND_PREFIX}{key}",
+                            default=options.get(f"{CONF_DEADBAND_PREFIX}{key}", deadband),
+                        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100))
+                        for key, deadband in ENTITY_DEADBANDS.items()
+                    },
                 }
             ),
         )
@@ -0,0 +1,244 @@
+"""Connection manager choosing between the local stove and the cloud relay."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CLOUD_RELAY_ADDRESS,
+    DEFAULT_LOCAL_PROBE_INTERVAL,
+    ENDPOINT_CLOUD,
+    ENDPOINT_LOCAL,
+)
+from .metrics import AduroMetrics, request_type
+from .transport import (
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_RETRY_POLICY,
+    FUNCTION_GET_STATUS,
+    FUNCTION_SET_SETTINGS,
+    AduroResponse,
+    AduroTimeoutError,
+    AduroTransport,
+    AduroTransportError,
+    RetryBudget,
+    async_retry,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HEALTH_WINDOW = 20
+LATENCY_SMOOTHING = 0.3
+# Latency (ms) at which an endpoint's score is halved, also assumed for an
+# endpoint that has not answered yet so it cannot outscore a measured LAN
+LATENCY_HALF_SCORE = 250.0
+
+
+@dataclass
+class EndpointHealth:
+    """Rolling success rate and latency of one endpoint."""
+
+    name: str
+    address: str
+    latency: float | None = None
+    results: deque[bool] = field(default_factory=lambda: deque(maxlen=HEALTH_WINDOW))
+    consecutive_failures: int = 0
+
+    @property
+    def success_rate(self) -> float:
+        """Return the share of recent requests that succeeded."""
+        if not self.results:
+            return 1.0
+        return sum(self.results) / len(self.results)
+
+    @property
+    def score(self) -> float:
+        """Return a score where higher means healthier."""
+        latency = LATENCY_HALF_SCORE if self.latency is None else self.latency
+        return self.success_rate / (1 + latency / LATENCY_HALF_SCORE)
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and its round trip time in ms."""
+        self.results.append(True)
+        self.consecutive_failures = 0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self.results.append(False)
+        self.consecutive_failures += 1
+
+    def mark_recovered(self) -> None:
+        """Forget failures from before the endpoint answered a probe."""
+        last = self.results[-1] if self.results else True
+        self.results.clear()
+        self.results.append(last)
+
+    def as_dict(self) -> dict[str, float | str | None]:
+        """Return the health figures for diagnostics."""
+        return {
+            "address": self.address,
+            "latency": None if self.latency is None else round(self.latency, 1),
+            "success_rate": round(self.success_rate, 2),
+            "score": round(self.score, 3),
+        }
+
+
+class AduroConnectionManager:
+    """Send requests to the healthiest of the local and cloud endpoints.
+
+    While the cloud relay is in use the local endpoint is probed in the
+    background, so requests move back to the LAN once the stove answers.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        transport: AduroTransport,
+        serial: str,
+        pin_code: str,
+        async_rediscover: Callable[[], Awaitable[None]],
+        metrics: AduroMetrics | None = None,
+    ) -> None:
+        """Initialize the connection manager."""
+        self.hass = hass
+        self.transport = transport
+        self.serial = serial
+        self.pin_code = pin_code
+        self._async_rediscover = async_rediscover
+        self.retry_policy = DEFAULT_RETRY_POLICY
+        self.metrics = metrics or AduroMetrics()
+        self.local: EndpointHealth | None = None
+        self.cloud = EndpointHealth(ENDPOINT_CLOUD, CLOUD_RELAY_ADDRESS)
+        self._unsub_probe: CALLBACK_TYPE | None = None
+
+    @property
+    def endpoint(self) -> EndpointHealth:
+        """Return the endpoint requests are sent to, preferring the LAN on ties."""
+        if self.local is not None and self.local.score >= self.cloud.score:
+            return self.local
+        return self.cloud
+
+    @property
+    def address(self) -> str:
+        """Return the address requests are sent to."""
+        return self.endpoint.address
+
+    def set_local_address(self, address: str | None) -> None:
+        """Set the stove's LAN address, None if it has none."""
+        if address is None or "0.0.0.0" in address:
+            self.local = None
+        elif self.local is None or self.local.address != address:
+            self.local = EndpointHealth(ENDPOINT_LOCAL, address)
+
+    @callback
+    def async_start(self) -> None:
+        """Start probing the local endpoint in the background."""
+        if self._unsub_probe is None:
+            self._unsub_probe = async_track_time_interval(
+                self.hass, self._async_probe_local, DEFAULT_LOCAL_PROBE_INTERVAL
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the background probe."""
+        if self._unsub_probe is not None:
+            self._unsub_probe()
+            self._unsub_probe = None
+
+    @property
+    def local_unreachable(self) -> bool:
+        """Return True if the stove should be looked for on the LAN again."""
+        return (
+            self.local is None
+            or self.local.consecutive_failures >= self.retry_policy.rediscover_after
+        )
+
+    async def async_request(
+        self, function_id: int, payload: str, budget: RetryBudget | None = None
+    ) -> AduroResponse:
+        """Send a request, retrying it according to the retry policy.
+
+        A retry goes to the other endpoint if the one that failed is still
+        the healthiest, so a stove lost on the LAN is reached via the cloud.
+        """
+        failed: EndpointHealth | None = None
+
+        async def async_attempt(attempt: int, timeout: float) -> AduroResponse:
+            nonlocal failed
+            endpoint = self.endpoint
+            if endpoint is failed:
+                endpoint = (self.cloud if endpoint is self.local else self.local) or endpoint
+            if attempt:
+                self.metrics.retries += 1
+            try:
+                return await self._async_send(endpoint, function_id, payload, timeout)
+            except AduroTransportError:
+                failed = endpoint
+                raise
+
+        return await async_retry(async_attempt, self.retry_policy, budget)
+
+    async def async_set(self, path: str, value: int | float | str) -> AduroResponse:
+        """Write a setting on the stove."""
+        return await self.async_request(FUNCTION_SET_SETTINGS, f"{path}={value}")
+
+    async def _async_send(
+        self,
+        endpoint: EndpointHealth,
+        function_id: int,
+        payload: str,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> AduroResponse:
+        """Send one request to an endpoint and record the outcome."""
+        metrics = self.metrics.request(request_type(function_id, payload))
+        self.metrics.record_endpoint(endpoint.name)
+        started = time.monotonic()
+        try:
+            response = await self.transport.async_request(
+                endpoint.address, self.serial, self.pin_code, function_id, payload, timeout
+            )
+        except AduroTimeoutError:
+            metrics.timeouts += 1
+            endpoint.record_failure()
+            raise
+        except AduroTransportError:
+            metrics.errors += 1
+            endpoint.record_failure()
+            raise
+        latency = (time.monotonic() - started) * 1000
+        metrics.record(latency)
+        endpoint.record_success(latency)
+        return response
+
+    async def _async_probe_local(self, now: datetime) -> None:
+        """Check whether the stove is reachable on the LAN again."""
+        if self.local is not None and self.endpoint is self.local:
+            return
+        if self.local is None:
+            await self._async_rediscover()
+            return
+        try:
+            await self._async_send(
+                self.local, FUNCTION_GET_STATUS, "*", self.retry_policy.timeout
+            )
+        except AduroTransportError:
+            _LOGGER.debug("Stove still unreachable at %s", self.local.address)
+            if self.local_unreachable:
+                await self._async_rediscover()
+            return
+        self.local.mark_recovered()
+        _LOGGER.debug(
+            "Local endpoint answered, score %.3f vs cloud %.3f",
+            self.local.score,
+            self.cloud.score,
+        )
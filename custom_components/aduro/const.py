@@ -12,50 +12,160 @@ CONF_MQTT_PORT = "mqtt_port"
 CONF_MQTT_USERNAME = "mqtt_username"
 CONF_MQTT_PASSWORD = "mqtt_password"
 CONF_MQTT_BASE_PATH = "mqtt_base_path"
+CONF_PARALLEL_FETCH = "parallel_fetch"
+CONF_MAX_IN_FLIGHT = "max_in_flight"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_IGNITION_SCAN_INTERVAL = "ignition_scan_interval"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+CONF_COMMAND_BOOST_DURATION = "command_boost_duration"
+CONF_PUSH_MODE = "push_mode"
+CONF_PUSH_INTERVAL = "push_interval"
+CONF_DEADBAND_PREFIX = "deadband_"  # followed by a key of ENTITY_DEADBANDS
 
 # Defaults
 DEFAULT_MQTT_PORT = 1883
 DEFAULT_MQTT_BASE_PATH = "aduro_h2/"
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=20)
+DEFAULT_CONSUMPTION_DAY_INTERVAL = timedelta(minutes=5)
+DEFAULT_CONSUMPTION_LONG_INTERVAL = timedelta(hours=1)
+DEFAULT_NETWORK_INTERVAL = timedelta(days=1)
+DEFAULT_ADAPTIVE_POLLING = True
+DEFAULT_IGNITION_SCAN_INTERVAL = timedelta(seconds=5)
+DEFAULT_IDLE_SCAN_INTERVAL = timedelta(seconds=60)
+DEFAULT_COMMAND_BOOST_DURATION = timedelta(seconds=60)
+DEFAULT_LOCAL_PROBE_INTERVAL = timedelta(minutes=1)
+DEFAULT_DISCOVERY_TTL = timedelta(days=7)
+DEFAULT_COMMAND_COALESCE_DELAY = 0.5  # seconds to collect a burst of writes
+DEFAULT_POLL_STAGGER = 2.0  # seconds between polls of different stoves
+DEFAULT_HISTORY_SAVE_INTERVAL = timedelta(minutes=15)
 DEFAULT_CAPACITY_PELLETS = 9.5
 DEFAULT_NOTIFICATION_LEVEL = 10
 DEFAULT_SHUTDOWN_LEVEL = 5
+DEFAULT_PARALLEL_FETCH = True
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_REFRESH_RETRY_BUDGET = 4  # retries shared by the requests of a refresh
+DEFAULT_BREAKER_THRESHOLD = 3  # failed refreshes in a row before polls pause
+DEFAULT_BREAKER_PROBE_INTERVAL = timedelta(minutes=2)
+DEFAULT_PUSH_MODE = False
+DEFAULT_PUSH_INTERVAL = timedelta(seconds=5)
 
-# State mappings
-STATE_NAMES = {
-    "0": "Operating {heatlevel}",
-    "2": "Operating {heatlevel}",
-    "4": "Operating {heatlevel}",
-    "5": "Operating {heatlevel}",
-    "6": "Stopped",
-    "9": "Off",
-    "13": "Stopped",
-    "14": "Off",
-    "20": "Stopped",
-    "28": "Stopped",
-    "32": "Operating III",
-    "34": "Stopped",
+# Endpoints
+CLOUD_RELAY_ADDRESS = "apprelay20.stokercloud.dk"
+ENDPOINT_LOCAL = "local"
+ENDPOINT_CLOUD = "cloud"
+
+# Request types with a latency sensor, named as in the metrics
+REQUEST_TYPES = (
+    "discover",
+    "status",
+    "total_days",
+    "total_months",
+    "total_years",
+    "network",
+    "set",
+)
+
+# Poll groups, each with its own interval and cache
+POLL_GROUP_STATUS = "status"
+POLL_GROUP_CONSUMPTION_DAY = "consumption_day"
+POLL_GROUP_CONSUMPTION_LONG = "consumption_long"
+POLL_GROUP_NETWORK = "network"
+
+# What each entity reads, keyed by the unique_id suffix after the serial.
+# Status fields and poll groups no enabled entity needs are not fetched.
+ENTITY_STATUS_FIELDS = {
+    "smoke_temp": ("smoke_temp",),
+    "shaft_temp": ("shaft_temp",),
+    "boiler_temp": ("boiler_temp",),
+    "power": ("power_kw", "state"),
+    "state": ("state", "substate", "fixed_power"),
+    "substate": ("state", "substate"),
+    "operation_mode": ("operation_mode",),
+    "oxygen": ("oxygen",),
+    "heatlevel_display": ("fixed_power",),
+    "heatlevel": ("fixed_power",),
+    "boiler_ref": ("boiler_ref",),
+    "toggle_mode": ("operation_mode",),
+    "status_main": ("state", "fixed_power"),
+    "status_sub": ("state", "substate"),
+    "timer_startup_1": ("state",),
+    "timer_startup_2": ("state",),
+}
+
+ENTITY_POLL_GROUPS = {
+    "consumption_day": (POLL_GROUP_CONSUMPTION_DAY,),
+    "consumption_yesterday": (POLL_GROUP_CONSUMPTION_DAY,),
+    "consumption_month": (POLL_GROUP_CONSUMPTION_LONG,),
+    "consumption_year": (POLL_GROUP_CONSUMPTION_LONG,),
+    "ip": (POLL_GROUP_NETWORK,),
+    "pellet_level": (POLL_GROUP_CONSUMPTION_DAY,),
+    "pellet_percentage": (POLL_GROUP_CONSUMPTION_DAY,),
+    "capacity_pellets": (),
+    "notification_level": (),
+    "shutdown_level": (),
+    "refilled": (),
+    "cleaned": (),
+    "refresh_duration": (),
+    "request_timeouts": (),
+    "request_retries": (),
+    "endpoint": (),
+    **{f"latency_{request}": () for request in REQUEST_TYPES},
+}
+
+# Smallest change of a numeric entity state that is written, keyed like
+# the tables above; other states are written on any change. These are the
+# defaults, each can be overridden in the options
+ENTITY_DEADBANDS = {
+    "smoke_temp": 0.5,
+    "shaft_temp": 0.5,
+    "boiler_temp": 0.1,
+    "power": 0.1,
+    "oxygen": 0.5,
+    "refresh_duration": 10.0,
+}
+
+# Status fields the coordinator itself needs for adaptive polling
+COORDINATOR_STATUS_FIELDS = ("state",)
+
+# State mappings to the option keys of the status sensors. The texts are
+# in the translations; "operating" is followed by the heat level.
+STATUS_MAIN_KEYS = {
+    "0": "operating",
+    "2": "operating",
+    "4": "operating",
+    "5": "operating",
+    "6": "stopped",
+    "9": "off",
+    "13": "stopped",
+    "14": "off",
+    "20": "stopped",
+    "28": "stopped",
+    "32": "operating_3",
+    "34": "stopped",
 }
 
-SUBSTATE_NAMES = {
-    "0": "Waiting",
-    "2": "Ignition 1",
-    "4": "Ignition 2",
-    "5": "Normal",
-    "6": "Room temperature reached",
-    "9": "Wood burning",
-    "13": "Failed ignition - Open door and check burner for pellet accumulation",
-    "14_0": "By button",
-    "14_1": "Wood burning?",
-    "20": "No fuel",
-    "28": "Unknown",
-    "32": "Heating up",
-    "34": "Check burn cup",
+# Keyed by state, or by state and substate where the substate matters
+STATUS_SUB_KEYS = {
+    "0": "waiting",
+    "2": "ignition_1",
+    "4": "ignition_2",
+    "5": "normal",
+    "6": "room_temperature_reached",
+    "9": "wood_burning",
+    "13": "failed_ignition",
+    "14_0": "by_button",
+    "14_1": "wood_burning_detected",
+    "20": "no_fuel",
+    "28": "unknown",
+    "32": "heating_up",
+    "34": "check_burn_cup",
 }
 
 # Startup states
 STARTUP_STATES = ["0", "2", "4", "5", "32"]
 SHUTDOWN_STATES = ["6", "9", "13", "14", "20", "28", "34"]
+IGNITION_STATES = ["2", "4"]
 
 # Heat level mappings
 HEAT_LEVEL_POWER_MAP = {
@@ -74,9 +184,11 @@ POWER_HEAT_LEVEL_MAP = {
 TIMER_STARTUP_1 = 870  # 14:30 minutes in seconds
 TIMER_STARTUP_2 = 870  # 14:30 minutes in seconds
 
-# Service names
+# Service names and fields
+ATTR_SERIAL = "serial"
 SERVICE_SET_HEATLEVEL = "set_heatlevel"
 SERVICE_SET_TEMPERATURE = "set_temperature"
 SERVICE_SET_OPERATION_MODE = "set_operation_mode"
 SERVICE_START_STOVE = "start_stove"
 SERVICE_STOP_STOVE = "stop_stove"
+SERVICE_GET_HISTORY = "get_history"
@@ -1,41 +1,138 @@
 """Data update coordinator for Aduro Hybrid Stove."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 import logging
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
-from pyduro.actions import discover, get, set, raw
 import paho.mqtt.client as mqtt
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-import asyncio
-import json
+from homeassistant.util import dt as dt_util
 
+from .breaker import AduroCircuitBreaker
+from .commands import AduroCommandQueue
+from .connection import AduroConnectionManager
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_COMMAND_BOOST_DURATION,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_IGNITION_SCAN_INTERVAL,
+    CONF_MAX_IN_FLIGHT,
     CONF_MQTT_BASE_PATH,
     CONF_MQTT_HOST,
     CONF_MQTT_PASSWORD,
     CONF_MQTT_PORT,
     CONF_MQTT_USERNAME,
     CONF_STOVE_PIN,
+    CONF_PARALLEL_FETCH,
+    CONF_PUSH_INTERVAL,
+    CONF_PUSH_MODE,
+    CONF_SCAN_INTERVAL,
     CONF_STOVE_SERIAL,
+    COORDINATOR_STATUS_FIELDS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_BREAKER_PROBE_INTERVAL,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_COMMAND_BOOST_DURATION,
+    DEFAULT_CONSUMPTION_DAY_INTERVAL,
+    DEFAULT_CONSUMPTION_LONG_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_IGNITION_SCAN_INTERVAL,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_NETWORK_INTERVAL,
+    DEFAULT_PARALLEL_FETCH,
+    DEFAULT_PUSH_INTERVAL,
+    DEFAULT_PUSH_MODE,
+    DEFAULT_REFRESH_RETRY_BUDGET,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
-    HEAT_LEVEL_POWER_MAP,
+    ENTITY_POLL_GROUPS,
+    ENTITY_STATUS_FIELDS,
+    IGNITION_STATES,
+    POLL_GROUP_CONSUMPTION_DAY,
+    POLL_GROUP_CONSUMPTION_LONG,
+    POLL_GROUP_NETWORK,
+    POLL_GROUP_STATUS,
+    POWER_HEAT_LEVEL_MAP,
+    SHUTDOWN_STATES,
 )
+from .discovery import async_get_discovery_cache
+from .history import StoveHistory
+from .listener import AduroStateListener
+from .metrics import REQUEST_DISCOVER, AduroMetrics
+from .pellets import AduroPelletTracker
+from .status import FULL_SCHEMA, STATE_SCHEMA, AduroStatus, compile_schema, parse_status
+from .transport import (
+    FUNCTION_GET_CONSUMPTION,
+    FUNCTION_GET_OPERATING,
+    FUNCTION_GET_SETTINGS,
+    FUNCTION_GET_STATUS,
+    AduroResponse,
+    AduroResponseError,
+    AduroTimeoutError,
+    AduroTransportError,
+    RetryBudget,
+    parse_operating_value,
+)
+
+if TYPE_CHECKING:
+    from .hub import AduroHub
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass
+class PollGroup:
+    """A group of requests sharing one poll interval and cache."""
+
+    name: str
+    interval: timedelta | None
+    fetches: tuple[Callable[[RetryBudget], Awaitable[dict[str, Any]]], ...]
+    data: dict[str, Any] = field(default_factory=dict)
+    updated: datetime | None = None
+    enabled: bool = True
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if the group should be fetched on this refresh."""
+        if not self.enabled:
+            return False
+        if self.interval is None or self.updated is None:
+            return True
+        if self.updated.date() != now.date():
+            return True
+        return now - self.updated >= self.interval
+
+    def store(self, parts: list[dict[str, Any]], now: datetime) -> None:
+        """Merge fetched parts into the cache.
+
+        Failed fetches return an empty dict; the group then keeps its old
+        values and stays due so it is retried on the next refresh.
+        """
+        for part in parts:
+            self.data.update(part)
+        if all(parts):
+            self.updated = now
+
 
 class AduroDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Aduro stove data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Initialize the coordinator."""
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, hub: AduroHub) -> None:
+        """Initialize the coordinator.
+
+        The hub owns the socket and decides when this stove is polled, so
+        the coordinator has no update interval of its own.
+        """
         self.entry = entry
+        self.hub = hub
         self.stove_serial = entry.data[CONF_STOVE_SERIAL]
         self.stove_pin = entry.data[CONF_STOVE_PIN]
         self.mqtt_host = entry.data[CONF_MQTT_HOST]
@@ -44,247 +141,527 @@ class AduroDataUpdateCoordinator(DataUpdateCoordinator):
         self.mqtt_password = entry.data.get(CONF_MQTT_PASSWORD)
         self.mqtt_base_path = entry.data.get(CONF_MQTT_BASE_PATH, "aduro_h2/")
         
-        self.stove_ip = None
+        self._address_known = False
+        self._ip_from_cache = False
+        self._discovery_cache = async_get_discovery_cache(hass)
+        self.transport = hub.transport
+        self.metrics = AduroMetrics()
+        self.connection = AduroConnectionManager(
+            hass,
+            self.transport,
+            self.stove_serial,
+            self.stove_pin,
+            self._async_discover_stove,
+            self.metrics,
+        )
         self.mqtt_client = None
         self._mqtt_data = {}
         
+        self.parallel_fetch = entry.options.get(CONF_PARALLEL_FETCH, DEFAULT_PARALLEL_FETCH)
+        self._request_semaphore = asyncio.Semaphore(
+            entry.options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT)
+        )
+        self._status_schema = FULL_SCHEMA
+        self._probe_operating = True
+        self.breaker = AduroCircuitBreaker(
+            self.stove_serial, DEFAULT_BREAKER_THRESHOLD, DEFAULT_BREAKER_PROBE_INTERVAL
+        )
+        self.history = StoveHistory()
+        self.pellets = AduroPelletTracker(hass, self.stove_serial)
+        
+        options = entry.options
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        self.scan_interval = timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.total_seconds())
+        )
+        self.ignition_scan_interval = timedelta(
+            seconds=options.get(
+                CONF_IGNITION_SCAN_INTERVAL, DEFAULT_IGNITION_SCAN_INTERVAL.total_seconds()
+            )
+        )
+        self.idle_scan_interval = timedelta(
+            seconds=options.get(
+                CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL.total_seconds()
+            )
+        )
+        self.command_boost_duration = timedelta(
+            seconds=options.get(
+                CONF_COMMAND_BOOST_DURATION, DEFAULT_COMMAND_BOOST_DURATION.total_seconds()
+            )
+        )
+        self.poll_interval = self.scan_interval
+        self._boost_until = 0.0
+        self.listener: AduroStateListener | None = None
+        if options.get(CONF_PUSH_MODE, DEFAULT_PUSH_MODE):
+            self.listener = AduroStateListener(
+                self,
+                timedelta(
+                    seconds=options.get(
+                        CONF_PUSH_INTERVAL, DEFAULT_PUSH_INTERVAL.total_seconds()
+                    )
+                ),
+            )
+        
+        self.commands = AduroCommandQueue(
+            hass, self._async_write, self._async_commands_sent
+        )
+        
+        # Status is fetched on every refresh, the other groups only when
+        # their own interval has passed or the date changed.
+        self.poll_groups: dict[str, PollGroup] = {
+            group.name: group
+            for group in (
+                PollGroup(POLL_GROUP_STATUS, None, (self._async_get_status,)),
+                PollGroup(
+                    POLL_GROUP_CONSUMPTION_DAY,
+                    DEFAULT_CONSUMPTION_DAY_INTERVAL,
+                    (self._async_get_consumption_days,),
+                ),
+                PollGroup(
+                    POLL_GROUP_CONSUMPTION_LONG,
+                    DEFAULT_CONSUMPTION_LONG_INTERVAL,
+                    (self._async_get_consumption_months, self._async_get_consumption_years),
+                ),
+                PollGroup(
+                    POLL_GROUP_NETWORK,
+                    DEFAULT_NETWORK_INTERVAL,
+                    (self._async_get_network,),
+                ),
+            )
+        }
+        
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=DEFAULT_SCAN_INTERVAL,
+            name=f"{DOMAIN} {self.stove_serial}",
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the stove."""
+        """Fetch the poll groups that are due from the stove."""
+        started = time.monotonic()
+        if self.breaker.is_open:
+            await self._async_probe_breaker(started)
+        # Retries of all requests of this refresh come out of one budget
+        budget = RetryBudget(DEFAULT_REFRESH_RETRY_BUDGET)
         try:
-            # Discover stove if we don't have IP yet
-            if not self.stove_ip:
+            # Use the cached address, or discover the stove if we have none
+            if not self._address_known:
+                await self._async_load_cached_address()
+                if not self._address_known:
+                    await self._async_discover_stove()
+                self.connection.async_start()
+            
+            now = dt_util.now()
+            due = [group for group in self.poll_groups.values() if group.is_due(now)]
+            fetches = [fetch(budget) for group in due for fetch in group.fetches]
+            if self.parallel_fetch:
+                results = await asyncio.gather(*fetches)
+            else:
+                results = [await fetch for fetch in fetches]
+            
+            position = 0
+            for group in due:
+                parts = results[position:position + len(group.fetches)]
+                position += len(group.fetches)
+                group.store(parts, now)
+            
+            status_group = self.poll_groups[POLL_GROUP_STATUS]
+            if (
+                self._ip_from_cache
+                and status_group.updated != now
+                and self.connection.local_unreachable
+            ):
+                # Only broadcast once the cached address stopped answering
+                _LOGGER.info(
+                    "Stove did not answer at cached address %s, rediscovering",
+                    self.stove_ip,
+                )
+                await self._discovery_cache.async_invalidate(self.stove_serial)
                 await self._async_discover_stove()
+                status_group.store([await self._async_get_status(budget)], now)
+            
+            if status_group.updated != now:
+                if self.breaker.record_failure():
+                    self._async_pause_polling()
+                    raise UpdateFailed("Stove did not answer, polls paused")
+            elif self.breaker.record_success():
+                self._async_resume_polling()
+            
+            if status_group.updated == now and self.status is not None:
+                self.history.record(now.timestamp(), self.status)
             
-            # Get status data
-            status_data = await self._async_get_status()
+            day_group = self.poll_groups[POLL_GROUP_CONSUMPTION_DAY]
+            if day_group.updated == now and "day" in day_group.data:
+                self.pellets.update(day_group.data["day"])
             
-            # Get consumption data
-            consumption_data = await self._async_get_consumption()
+            duration = (time.monotonic() - started) * 1000
+            self.metrics.record_refresh(duration, True)
+            _LOGGER.debug(
+                "Refresh of %s took %.0f ms (%s): %s",
+                ", ".join(group.name for group in due),
+                duration,
+                "parallel" if self.parallel_fetch else "sequential",
+                ", ".join(
+                    f"{name}={metrics.last:.0f} ms"
+                    for name, metrics in self.metrics.requests.items()
+                    if metrics.last is not None
+                ),
+            )
+            
+            self._adapt_update_interval()
             
             return {
-                "status": status_data,
-                "consumption": consumption_data,
+                "status": self.status,
+                "consumption": {
+                    **self.poll_groups[POLL_GROUP_CONSUMPTION_DAY].data,
+                    **self.poll_groups[POLL_GROUP_CONSUMPTION_LONG].data,
+                },
+                "network": self.poll_groups[POLL_GROUP_NETWORK].data,
                 "ip": self.stove_ip,
+                "endpoint": self.connection.endpoint.name,
                 "serial": self.stove_serial,
             }
+        except UpdateFailed:
+            self.metrics.record_refresh((time.monotonic() - started) * 1000, False)
+            raise
         except Exception as err:
+            self.metrics.record_refresh((time.monotonic() - started) * 1000, False)
             _LOGGER.error("Error fetching Aduro data: %s", err)
             raise UpdateFailed(f"Error communicating with stove: {err}")
 
-    async def _async_discover_stove(self) -> None:
-        """Discover the stove on the network."""
-        def discover_stove():
-            try:
-                response = discover.run()
-                data = response.parse_payload()
-                ip = data.get("IP", "apprelay20.stokercloud.dk")
-                
-                # Fallback to cloud if local IP is invalid
-                if "0.0.0.0" in ip:
-                    ip = "apprelay20.stokercloud.dk"
-                
-                return ip
-            except Exception as e:
-                _LOGGER.warning("Discovery failed, using cloud address: %s", e)
-                return "apprelay20.stokercloud.dk"
+    async def _async_probe_breaker(self, started: float) -> None:
+        """Send the state probe of an open breaker.
+
+        Raises UpdateFailed while the stove stays silent, so the entities
+        remain unavailable; the first answer closes the breaker and the
+        refresh goes on with the full poll.
+        """
+        try:
+            await self._async_probe()
+        except AduroTransportError as err:
+            self.metrics.record_refresh((time.monotonic() - started) * 1000, False)
+            _LOGGER.debug("Stove %s still unreachable: %s", self.stove_serial, err)
+            raise UpdateFailed(f"Stove unreachable: {err}") from err
+        self.breaker.record_success()
+        self._async_resume_polling()
+
+    @callback
+    def _async_pause_polling(self) -> None:
+        """Poll only at the probe interval while the breaker is open."""
+        self.poll_interval = self.breaker.probe_interval
+        self.connection.async_stop()
+
+    @callback
+    def _async_resume_polling(self) -> None:
+        """Return to the normal poll schedule once the breaker closed."""
+        self.poll_interval = self.scan_interval
+        self._adapt_update_interval()
+        self.connection.async_start()
+
+    def _adapt_update_interval(self) -> None:
+        """Pick the poll interval from the last parsed stove state.
+
+        Poll fast during ignition and right after a control command, back
+        off while the stove is off and use the normal interval otherwise.
+        """
+        if not self.adaptive_polling:
+            return
         
-        self.stove_ip = await self.hass.async_add_executor_job(discover_stove)
-        _LOGGER.debug("Discovered stove at: %s", self.stove_ip)
+        state = self.status.state if self.status else None
+        if time.monotonic() < self._boost_until or state in IGNITION_STATES:
+            interval = self.ignition_scan_interval
+        elif state in SHUTDOWN_STATES:
+            interval = self.idle_scan_interval
+        else:
+            interval = self.scan_interval
+        
+        if interval != self.poll_interval:
+            _LOGGER.debug("Stove state %s, polling every %s", state, interval)
+            self.poll_interval = interval
 
-    async def _async_get_status(self) -> dict[str, Any]:
-        """Get status data from the stove."""
-        def get_status():
-            try:
-                from pyduro.actions import STATUS_PARAMS
-                
-                response = raw.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    function_id=11,
-                    payload="*"
-                )
-                
-                status = response.parse_payload().split(",")
-                
-                # Parse status into dictionary
-                status_dict = {}
-                i = 0
-                for key in STATUS_PARAMS:
-                    if i < len(status):
-                        status_dict[key] = status[i]
-                    i += 1
-                
-                return status_dict
-            except Exception as e:
-                _LOGGER.error("Failed to get status: %s", e)
-                return {}
+    @callback
+    def async_update_required_fields(self) -> None:
+        """Limit fetching and parsing to what the enabled entities read.
+
+        Called once the platforms are set up; enabling or disabling an
+        entity reloads the config entry, which calls this again. An entity
+        missing from the requirement tables switches everything back on.
+        """
+        registry = er.async_get(self.hass)
+        prefix = f"{self.stove_serial}_"
+        fields = set(COORDINATOR_STATUS_FIELDS)
+        groups = {POLL_GROUP_STATUS}
+        for entity in er.async_entries_for_config_entry(registry, self.entry.entry_id):
+            if entity.disabled_by is not None:
+                continue
+            key = entity.unique_id.removeprefix(prefix)
+            if key not in ENTITY_STATUS_FIELDS and key not in ENTITY_POLL_GROUPS:
+                _LOGGER.debug("No requirements known for %s, fetching everything", key)
+                fields = None
+                groups = set(self.poll_groups)
+                break
+            fields.update(ENTITY_STATUS_FIELDS.get(key, ()))
+            groups.update(ENTITY_POLL_GROUPS.get(key, ()))
         
-        return await self.hass.async_add_executor_job(get_status)
+        self._status_schema = compile_schema(fields)
+        for group in self.poll_groups.values():
+            group.enabled = group.name in groups
+        _LOGGER.debug(
+            "Fetching poll groups %s, parsing status fields %s",
+            sorted(groups),
+            "all" if fields is None else sorted(fields),
+        )
+
+    @property
+    def status(self) -> AduroStatus | None:
+        """Return the last parsed status snapshot."""
+        return self.poll_groups[POLL_GROUP_STATUS].data.get("status")
+
+    def last_fetched(self, group: str) -> datetime | None:
+        """Return when a poll group was last fetched successfully."""
+        return self.poll_groups[group].updated
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and stop polling this stove."""
+        await super().async_shutdown()
+        if self.listener is not None:
+            self.listener.async_stop()
+        self.connection.async_stop()
+        self.commands.async_shutdown()
+        await self.hub.async_remove(self)
+
+    async def async_probe_state(self) -> tuple[str | None, str | None] | None:
+        """Return the state and substate of the stove, None if it did not answer."""
+        try:
+            return await self._async_probe()
+        except AduroTransportError as err:
+            _LOGGER.debug("State probe failed: %s", err)
+            return None
+
+    async def _async_probe(self) -> tuple[str | None, str | None]:
+        """Return the state and substate of the stove.
 
-    async def _async_get_consumption(self) -> dict[str, Any]:
-        """Get consumption data from the stove."""
-        def get_consumption():
+        Asks for the "state" and "substate" operating values, whose replies
+        ("state=5") are a few bytes each instead of the full status. A stove
+        that rejects them or answers anything else is probed with the status
+        request from then on, parsed for those two fields only. Probes are
+        sent once: a lost probe is simply repeated on the next interval.
+        """
+        if self._probe_operating:
+            if (values := await self._async_probe_operating()) is not None:
+                return values
+            self._probe_operating = False
+        response = await self._async_request(FUNCTION_GET_STATUS, "*", RetryBudget(0))
+        status = parse_status(response.payload, STATE_SCHEMA)
+        return status.state, status.substate
+
+    async def _async_probe_operating(self) -> tuple[str, str] | None:
+        """Return the state and substate operating values, None if unsupported."""
+        values = []
+        for name in ("state", "substate"):
             try:
-                from datetime import date, timedelta
-                
-                # Get daily consumption
-                response = raw.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    function_id=6,
-                    payload="total_days"
-                )
-                
-                data = response.payload.split(',')
-                data[0] = data[0][11:]  # Remove "total_days" prefix
-                
-                today = date.today().day
-                yesterday = (date.today() - timedelta(1)).day
-                
-                consumption_today = float(data[today - 1])
-                consumption_yesterday = float(data[yesterday - 1])
-                
-                # Get monthly consumption
-                response = raw.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    function_id=6,
-                    payload="total_months"
+                response = await self._async_request(
+                    FUNCTION_GET_OPERATING, name, RetryBudget(0)
                 )
-                
-                data = response.payload.split(',')
-                data[0] = data[0][13:]  # Remove "total_months" prefix
-                month = date.today().month
-                consumption_month = float(data[month - 1])
-                
-                # Get yearly consumption
-                response = raw.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    function_id=6,
-                    payload="total_years"
+            except AduroResponseError:
+                value = None
+            else:
+                value = parse_operating_value(response.payload, name)
+            if value is None:
+                _LOGGER.debug(
+                    "Stove %s does not report the %s operating value, probing the status instead",
+                    self.stove_serial,
+                    name,
                 )
-                
-                data = response.payload.split(',')
-                data[0] = data[0][12:]  # Remove "total_years" prefix
-                year = date.today().year
-                data_position = year - (year - (len(data) - 1))
-                consumption_year = float(data[data_position])
-                
-                return {
-                    "day": consumption_today,
-                    "yesterday": consumption_yesterday,
-                    "month": consumption_month,
-                    "year": consumption_year,
-                }
-            except Exception as e:
-                _LOGGER.error("Failed to get consumption data: %s", e)
-                return {}
+                return None
+            values.append(value)
+        return values[0], values[1]
+
+    async def _async_request(
+        self, function_id: int, payload: str, budget: RetryBudget | None = None
+    ) -> AduroResponse:
+        """Send a request to the stove over the shared socket.
+
+        The number of requests in flight is capped by the request semaphore.
+        Retries come out of the budget, if given; the connection manager
+        records their latency in the metrics.
+        """
+        async with self._request_semaphore:
+            return await self.connection.async_request(function_id, payload, budget)
+
+    async def _async_set(self, path: str, value: int) -> None:
+        """Queue a write; bursts are coalesced and followed by one refresh."""
+        await self.commands.async_enqueue(path, value)
+
+    async def _async_write(self, path: str, value: int) -> None:
+        """Write a setting on the stove."""
+        await self.connection.async_set(path, value)
+
+    async def _async_commands_sent(self) -> None:
+        """Refresh once after a batch of writes was sent."""
+        if self.adaptive_polling and not self.breaker.is_open:
+            self._boost_until = time.monotonic() + self.command_boost_duration.total_seconds()
+            self.poll_interval = self.ignition_scan_interval
+        await self.async_request_refresh()
+        self.hub.async_schedule(self)
+
+    async def _async_load_cached_address(self) -> None:
+        """Use the address from the discovery cache if it is still fresh."""
+        if (stove := await self._discovery_cache.async_get(self.stove_serial)) is None:
+            return
+        self.connection.set_local_address(stove["ip"])
+        self._address_known = True
+        self._ip_from_cache = True
+        _LOGGER.debug("Using cached stove address: %s", self.stove_ip)
+
+    async def _async_discover_stove(self) -> None:
+        """Discover the stove's LAN address.
+
+        Without a usable LAN address all requests go to the cloud relay,
+        the connection manager keeps looking for the stove in the background.
+        """
+        self._ip_from_cache = False
+        self._address_known = True
+        metrics = self.metrics.request(REQUEST_DISCOVER)
+        started = time.monotonic()
+        try:
+            data = await self.transport.async_discover(serial=self.stove_serial)
+        except Exception as e:
+            if isinstance(e, AduroTimeoutError):
+                metrics.timeouts += 1
+            else:
+                metrics.errors += 1
+            _LOGGER.warning("Discovery failed, using %s: %s", self.connection.address, e)
+            return
         
-        return await self.hass.async_add_executor_job(get_consumption)
+        metrics.record((time.monotonic() - started) * 1000)
+        ip = data.get("IP")
+        self.connection.set_local_address(ip)
+        if self.connection.local is not None:
+            await self._discovery_cache.async_save(data)
+        _LOGGER.debug("Discovered stove at: %s", ip)
+
+    @property
+    def stove_ip(self) -> str | None:
+        """Return the address requests are currently sent to."""
+        if not self._address_known:
+            return None
+        return self.connection.address
+
+    async def _async_get_status(self, budget: RetryBudget) -> dict[str, Any]:
+        """Get status data from the stove."""
+        try:
+            response = await self._async_request(FUNCTION_GET_STATUS, "*", budget)
+        except Exception as e:
+            _LOGGER.error("Failed to get status: %s", e)
+            return {}
+        
+        return {"status": parse_status(response.payload, self._status_schema)}
+
+    async def _async_get_consumption_days(self, budget: RetryBudget) -> dict[str, Any]:
+        """Get daily consumption data from the stove."""
+        try:
+            response = await self._async_request(FUNCTION_GET_CONSUMPTION, "total_days", budget)
+            
+            data = response.payload.split(',')
+            data[0] = data[0][11:]  # Remove "total_days" prefix
+            
+            today = date.today().day
+            yesterday = (date.today() - timedelta(1)).day
+            
+            return {
+                "day": float(data[today - 1]),
+                "yesterday": float(data[yesterday - 1]),
+            }
+        except Exception as e:
+            _LOGGER.error("Failed to get daily consumption data: %s", e)
+            return {}
+
+    async def _async_get_consumption_months(self, budget: RetryBudget) -> dict[str, Any]:
+        """Get monthly consumption data from the stove."""
+        try:
+            response = await self._async_request(FUNCTION_GET_CONSUMPTION, "total_months", budget)
+            
+            data = response.payload.split(',')
+            data[0] = data[0][13:]  # Remove "total_months" prefix
+            month = date.today().month
+            
+            return {"month": float(data[month - 1])}
+        except Exception as e:
+            _LOGGER.error("Failed to get monthly consumption data: %s", e)
+            return {}
+
+    async def _async_get_consumption_years(self, budget: RetryBudget) -> dict[str, Any]:
+        """Get yearly consumption data from the stove."""
+        try:
+            response = await self._async_request(FUNCTION_GET_CONSUMPTION, "total_years", budget)
+            
+            data = response.payload.split(',')
+            data[0] = data[0][12:]  # Remove "total_years" prefix
+            year = date.today().year
+            data_position = year - (year - (len(data) - 1))
+            
+            return {"year": float(data[data_position])}
+        except Exception as e:
+            _LOGGER.error("Failed to get yearly consumption data: %s", e)
+            return {}
+
+    async def _async_get_network(self, budget: RetryBudget) -> dict[str, Any]:
+        """Get the stove's Wi-Fi network settings."""
+        try:
+            response = await self._async_request(FUNCTION_GET_SETTINGS, "wifi.router", budget)
+            
+            data = response.payload.split(',')
+            
+            return {
+                "router_ssid": data[0][7:],  # Remove "router=" prefix
+                "stove_ip": data[4],
+                "router_ip": data[5],
+                "stove_rssi": data[6],
+                "stove_mac": data[9],
+            }
+        except Exception as e:
+            _LOGGER.error("Failed to get network data: %s", e)
+            return {}
 
     async def async_set_heatlevel(self, level: int) -> None:
         """Set the heat level."""
-        def set_level():
-            try:
-                response = set.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    path="regulation.fixed_power",
-                    value=HEAT_LEVEL_POWER_MAP.get(level, 50),
-                )
-                return response.parse_payload()
-            except Exception as e:
-                _LOGGER.error("Failed to set heat level: %s", e)
-                raise
-        
-        await self.hass.async_add_executor_job(set_level)
-        await self.async_request_refresh()
+        if level not in POWER_HEAT_LEVEL_MAP:
+            raise ServiceValidationError(f"Heat level must be 1, 2 or 3, not {level}")
+        try:
+            await self._async_set("regulation.fixed_power", POWER_HEAT_LEVEL_MAP[level])
+        except Exception as e:
+            _LOGGER.error("Failed to set heat level: %s", e)
+            raise
 
     async def async_set_temperature(self, temperature: int) -> None:
         """Set the target temperature."""
-        def set_temp():
-            try:
-                response = set.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    path="boiler.temp",
-                    value=temperature,
-                )
-                return response.parse_payload()
-            except Exception as e:
-                _LOGGER.error("Failed to set temperature: %s", e)
-                raise
-        
-        await self.hass.async_add_executor_job(set_temp)
-        await self.async_request_refresh()
+        try:
+            await self._async_set("boiler.temp", temperature)
+        except Exception as e:
+            _LOGGER.error("Failed to set temperature: %s", e)
+            raise
 
     async def async_set_operation_mode(self, mode: int) -> None:
         """Set the operation mode."""
-        def set_mode():
-            try:
-                response = set.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    path="regulation.operation_mode",
-                    value=mode,
-                )
-                return response.parse_payload()
-            except Exception as e:
-                _LOGGER.error("Failed to set operation mode: %s", e)
-                raise
-        
-        await self.hass.async_add_executor_job(set_mode)
-        await self.async_request_refresh()
+        try:
+            await self._async_set("regulation.operation_mode", mode)
+        except Exception as e:
+            _LOGGER.error("Failed to set operation mode: %s", e)
+            raise
 
     async def async_start_stove(self) -> None:
         """Start the stove."""
-        def start():
-            try:
-                response = set.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    path="misc.start",
-                    value=1,
-                )
-                return response.parse_payload()
-            except Exception as e:
-                _LOGGER.error("Failed to start stove: %s", e)
-                raise
-        
-        await self.hass.async_add_executor_job(start)
-        await self.async_request_refresh()
+        try:
+            await self._async_set("misc.start", 1)
+        except Exception as e:
+            _LOGGER.error("Failed to start stove: %s", e)
+            raise
 
     async def async_stop_stove(self) -> None:
         """Stop the stove."""
-        def stop():
-            try:
-                response = set.run(
-                    burner_address=self.stove_ip,
-                    serial=self.stove_serial,
-                    pin_code=self.stove_pin,
-                    path="misc.stop",
-                    value=1,
-                )
-                return response.parse_payload()
-            except Exception as e:
-                _LOGGER.error("Failed to stop stove: %s", e)
-                raise
-        
-        await self.hass.async_add_executor_job(stop)
-        await self.async_request_refresh()
+        try:
+            await self._async_set("misc.stop", 1)
+        except Exception as e:
+            _LOGGER.error("Failed to stop stove: %s", e)
+            raise
@@ -0,0 +1,54 @@
+"""Diagnostics support for Aduro Hybrid Stove."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_MQTT_PASSWORD, CONF_MQTT_USERNAME, CONF_STOVE_PIN, DOMAIN
+from .coordinator import AduroDataUpdateCoordinator
+
+TO_REDACT = {CONF_STOVE_PIN, CONF_MQTT_USERNAME, CONF_MQTT_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: AduroDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    connection = coordinator.connection
+    status = coordinator.status
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "polling": {
+            "poll_interval": coordinator.poll_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "push_mode": coordinator.listener is not None,
+            "breaker": coordinator.breaker.as_dict(),
+            "stoves_on_hub": len(coordinator.hub.coordinators),
+            "groups": {
+                name: {
+                    "enabled": group.enabled,
+                    "interval": None
+                    if group.interval is None
+                    else group.interval.total_seconds(),
+                    "updated": None if group.updated is None else group.updated.isoformat(),
+                }
+                for name, group in coordinator.poll_groups.items()
+            },
+        },
+        "endpoints": {
+            "current": connection.endpoint.name,
+            "local": None if connection.local is None else connection.local.as_dict(),
+            "cloud": connection.cloud.as_dict(),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "status": None if status is None else asdict(status),
+    }
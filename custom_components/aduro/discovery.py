@@ -0,0 +1,84 @@
+"""Persistent cache of discovered Aduro stoves."""
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_DISCOVERY_TTL, DOMAIN
+from .transport import normalize_serial
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISCOVERY_CACHE = f"{DOMAIN}_discovery_cache"
+STORAGE_KEY = f"{DOMAIN}.discovery"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+def _key(serial: str) -> str:
+    """Return the serial stoves are cached under, as sent on the wire."""
+    return normalize_serial(serial.strip())
+
+
+class AduroDiscoveryCache:
+    """Last discovery reply per stove serial, persisted with a TTL."""
+
+    def __init__(self, hass: HomeAssistant, ttl: timedelta = DEFAULT_DISCOVERY_TTL) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._ttl = ttl
+        self._stoves: dict[str, dict[str, Any]] | None = None
+
+    async def _async_load(self) -> dict[str, dict[str, Any]]:
+        """Load the cache from disk on first use."""
+        if self._stoves is None:
+            self._stoves = await self._store.async_load() or {}
+        return self._stoves
+
+    async def async_get(self, serial: str) -> dict[str, Any] | None:
+        """Return the cached stove if it was discovered within the TTL."""
+        stove = (await self._async_load()).get(_key(serial))
+        if stove is None:
+            return None
+        discovered = dt_util.parse_datetime(stove.get("discovered", ""))
+        if discovered is None or dt_util.utcnow() - discovered > self._ttl:
+            _LOGGER.debug("Cached discovery for %s has expired", serial)
+            return None
+        return stove
+
+    async def async_save(self, reply: dict[str, str]) -> None:
+        """Store a discovery reply keyed by the serial it reports."""
+        serial = reply.get("Serial")
+        ip = reply.get("IP")
+        if not serial or not ip or "0.0.0.0" in ip:
+            return
+        stoves = await self._async_load()
+        stoves[_key(serial)] = {
+            "ip": ip,
+            "type": reply.get("Type"),
+            "version": reply.get("Ver"),
+            "build": reply.get("Build"),
+            "discovered": dt_util.utcnow().isoformat(),
+        }
+        self._store.async_delay_save(lambda: stoves, SAVE_DELAY)
+
+    async def async_invalidate(self, serial: str) -> None:
+        """Drop a stove whose cached address stopped answering."""
+        stoves = await self._async_load()
+        if stoves.pop(_key(serial), None) is not None:
+            self._store.async_delay_save(lambda: stoves, SAVE_DELAY)
+
+
+@callback
+def async_get_discovery_cache(hass: HomeAssistant) -> AduroDiscoveryCache:
+    """Return the discovery cache shared by all config entries."""
+    if (cache := hass.data.get(DATA_DISCOVERY_CACHE)) is None:
+        cache = hass.data[DATA_DISCOVERY_CACHE] = AduroDiscoveryCache(hass)
+    return cache
@@ -0,0 +1,72 @@
+"""Base entity for Aduro Hybrid Stove."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_DEADBAND_PREFIX, DOMAIN, ENTITY_DEADBANDS
+from .coordinator import AduroDataUpdateCoordinator
+
+
+class AduroEntity(CoordinatorEntity[AduroDataUpdateCoordinator]):
+    """Entity belonging to the device of one stove.
+
+    Coordinator updates only write the state when the availability, icon,
+    attributes or state changed. Numeric states listed in ENTITY_DEADBANDS
+    must also move at least the deadband away from the last written value;
+    the options can override each deadband.
+    """
+
+    def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.stove_serial)},
+            manufacturer="Aduro",
+            model="Hybrid Stove",
+            name=f"Aduro Stove {coordinator.stove_serial}",
+            serial_number=coordinator.stove_serial,
+        )
+        self._deadband = 0.0
+        self._written: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Look up the deadband once the unique id is known."""
+        await super().async_added_to_hass()
+        key = (self.unique_id or "").removeprefix(f"{self.coordinator.stove_serial}_")
+        self._deadband = self.coordinator.entry.options.get(
+            f"{CONF_DEADBAND_PREFIX}{key}", ENTITY_DEADBANDS.get(key, 0.0)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if it changed meaningfully since the last write."""
+        self._async_write_if_changed()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write the state unless it is within the deadband of the last write."""
+        snapshot = (
+            self.available,
+            self.icon,
+            self.extra_state_attributes,
+            self.state,
+        )
+        if self._written is not None and not self._changed(self._written, snapshot):
+            return
+        self._written = snapshot
+        self.async_write_ha_state()
+
+    def _changed(self, old: tuple[Any, ...], new: tuple[Any, ...]) -> bool:
+        """Return True if the new snapshot differs beyond the deadband."""
+        if old[:-1] != new[:-1]:
+            return True
+        old_state, new_state = old[-1], new[-1]
+        if self._deadband and isinstance(old_state, (int, float)) and isinstance(
+            new_state, (int, float)
+        ):
+            return abs(new_state - old_state) >= self._deadband
+        return old_state != new_state
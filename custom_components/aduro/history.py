@@ -0,0 +1,287 @@
+"""Compact time series of status snapshots per stove."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from contextlib import closing
+from dataclasses import dataclass
+import logging
+import math
+import sqlite3
+import struct
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN
+from .status import AduroStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_DATABASE = f"{DOMAIN}_history.db"
+
+# Recorded status attributes; state is a code, so buckets keep its last value
+CHANNELS = ("smoke_temp", "shaft_temp", "boiler_temp", "power_kw", "oxygen", "state")
+LAST_VALUE_CHANNELS = frozenset({"state"})
+
+_HEADER = struct.Struct("<II")
+# Open bucket of a tier: start, then sums, counts and last values per channel
+_OPEN_BUCKET = struct.Struct(f"<d{len(CHANNELS)}d{len(CHANNELS)}I{len(CHANNELS)}d")
+OPEN_BUCKET_SUFFIX = ".open"
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryTier:
+    """One resolution of the history and how many buckets it keeps."""
+
+    name: str
+    resolution: int
+    size: int
+
+
+HISTORY_TIERS = (
+    HistoryTier("raw", 20, 24 * 180),  # 24 hours of 20 s
+    HistoryTier("5min", 300, 7 * 288),  # 7 days of 5 minutes
+    HistoryTier("hour", 3600, 365 * 24),  # a year of hours
+)
+
+
+class RingBuffer:
+    """Fixed size columns of samples; the oldest sample is overwritten first."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty buffer."""
+        self.size = size
+        self.head = 0
+        self.count = 0
+        self.timestamps = array("d", bytes(8 * size))
+        self.columns = [array("f", bytes(4 * size)) for _ in CHANNELS]
+
+    def append(self, timestamp: float, values: list[float]) -> None:
+        """Add a sample."""
+        head = self.head
+        self.timestamps[head] = timestamp
+        for column, value in zip(self.columns, values):
+            column[head] = value
+        self.head = (head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def indexes(self, start: float, end: float) -> list[int]:
+        """Return the positions of the samples in [start, end], oldest first."""
+        first = (self.head - self.count) % self.size
+        positions = ((first + offset) % self.size for offset in range(self.count))
+        timestamps = self.timestamps
+        return [pos for pos in positions if start <= timestamps[pos] <= end]
+
+    def dump(self) -> bytes:
+        """Return the buffer as bytes for storage."""
+        return b"".join(
+            [
+                _HEADER.pack(self.head, self.count),
+                self.timestamps.tobytes(),
+                *(column.tobytes() for column in self.columns),
+            ]
+        )
+
+    def load(self, data: bytes) -> None:
+        """Restore the buffer from dump(), ignoring data of another layout."""
+        expected = _HEADER.size + self.size * (8 + 4 * len(CHANNELS))
+        if len(data) != expected:
+            _LOGGER.debug("Ignoring stored history of %d bytes", len(data))
+            return
+        self.head, self.count = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        self.timestamps = array("d", data[offset:offset + 8 * self.size])
+        offset += 8 * self.size
+        for index in range(len(self.columns)):
+            self.columns[index] = array("f", data[offset:offset + 4 * self.size])
+            offset += 4 * self.size
+
+
+class RollupTier:
+    """Aggregate samples into buckets of one resolution."""
+
+    def __init__(self, tier: HistoryTier) -> None:
+        """Initialize the tier."""
+        self.tier = tier
+        self.buffer = RingBuffer(tier.size)
+        self._bucket: float | None = None
+        self._sums = [0.0] * len(CHANNELS)
+        self._counts = [0] * len(CHANNELS)
+        self._last = [math.nan] * len(CHANNELS)
+
+    def add(self, timestamp: float, values: list[float]) -> None:
+        """Add a sample, closing the previous bucket when a new one starts."""
+        bucket = timestamp - timestamp % self.tier.resolution
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        for index, value in enumerate(values):
+            if not math.isnan(value):
+                self._sums[index] += value
+                self._counts[index] += 1
+                self._last[index] = value
+
+    def current(self) -> tuple[float, list[float]] | None:
+        """Return the start and values of the open bucket so far."""
+        if self._bucket is None:
+            return None
+        return self._bucket, [
+            last if channel in LAST_VALUE_CHANNELS or not count else total / count
+            for channel, total, count, last in zip(
+                CHANNELS, self._sums, self._counts, self._last
+            )
+        ]
+
+    def flush(self) -> None:
+        """Write the open bucket to the buffer."""
+        if (current := self.current()) is None:
+            return
+        self.buffer.append(*current)
+        self._bucket = None
+        self._sums = [0.0] * len(CHANNELS)
+        self._counts = [0] * len(CHANNELS)
+        self._last = [math.nan] * len(CHANNELS)
+
+    def dump_open(self) -> bytes:
+        """Return the open bucket as bytes for storage, empty if there is none."""
+        if self._bucket is None:
+            return b""
+        return _OPEN_BUCKET.pack(self._bucket, *self._sums, *self._counts, *self._last)
+
+    def load_open(self, data: bytes) -> None:
+        """Restore the open bucket from dump_open()."""
+        if len(data) != _OPEN_BUCKET.size:
+            return
+        values = _OPEN_BUCKET.unpack(data)
+        channels = len(CHANNELS)
+        self._bucket = values[0]
+        self._sums = list(values[1:1 + channels])
+        self._counts = list(values[1 + channels:1 + 2 * channels])
+        self._last = list(values[1 + 2 * channels:])
+
+
+class StoveHistory:
+    """Status history of one stove at every resolution."""
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self.tiers = {tier.name: RollupTier(tier) for tier in HISTORY_TIERS}
+
+    def record(self, timestamp: float, status: AduroStatus) -> None:
+        """Add a status snapshot."""
+        values = [_as_float(getattr(status, channel)) for channel in CHANNELS]
+        for tier in self.tiers.values():
+            tier.add(timestamp, values)
+
+    def query(
+        self,
+        resolution: str,
+        start: float,
+        end: float,
+        channels: Iterable[str] = CHANNELS,
+    ) -> dict[str, Any]:
+        """Return the samples in a time range as columns.
+
+        The bucket still being filled is included as the last sample.
+        """
+        tier = self.tiers[resolution]
+        buffer = tier.buffer
+        positions = buffer.indexes(start, end)
+        current = tier.current()
+        if current is not None and not start <= current[0] <= end:
+            current = None
+        result: dict[str, Any] = {
+            "resolution": resolution,
+            "timestamps": [buffer.timestamps[pos] for pos in positions],
+        }
+        if current is not None:
+            result["timestamps"].append(float(current[0]))
+        for channel in channels:
+            index = CHANNELS.index(channel)
+            column = buffer.columns[index]
+            values = [column[pos] for pos in positions]
+            if current is not None:
+                values.append(current[1][index])
+            result[channel] = [
+                None if math.isnan(value) else round(value, 2) for value in values
+            ]
+        return result
+
+    def dump(self) -> dict[str, bytes]:
+        """Return the buffers and open buckets of all tiers for storage."""
+        buffers = {}
+        for name, tier in self.tiers.items():
+            buffers[name] = tier.buffer.dump()
+            buffers[name + OPEN_BUCKET_SUFFIX] = tier.dump_open()
+        return buffers
+
+    def load(self, buffers: dict[str, bytes]) -> None:
+        """Restore buffers returned by dump()."""
+        for name, data in buffers.items():
+            if (tier := self.tiers.get(name.removesuffix(OPEN_BUCKET_SUFFIX))) is None:
+                continue
+            if name.endswith(OPEN_BUCKET_SUFFIX):
+                tier.load_open(data)
+            else:
+                tier.buffer.load(data)
+
+
+class AduroHistoryStore:
+    """SQLite file under .storage holding the history of every stove."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.path = hass.config.path(STORAGE_DIR, HISTORY_DATABASE)
+
+    async def async_load(self, serial: str) -> dict[str, bytes]:
+        """Return the stored buffers of a stove."""
+        try:
+            return await self.hass.async_add_executor_job(self._load, serial)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Failed to load history of %s: %s", serial, err)
+            return {}
+
+    async def async_save(self, serial: str, buffers: dict[str, bytes]) -> None:
+        """Store the buffers of a stove."""
+        try:
+            await self.hass.async_add_executor_job(self._save, serial, buffers)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Failed to save history of %s: %s", serial, err)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the table on first use."""
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "serial TEXT, tier TEXT, data BLOB, PRIMARY KEY (serial, tier))"
+        )
+        return connection
+
+    def _load(self, serial: str) -> dict[str, bytes]:
+        """Read the buffers of a stove."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT tier, data FROM history WHERE serial = ?", (serial,)
+            )
+            return {tier: bytes(data) for tier, data in rows}
+
+    def _save(self, serial: str, buffers: dict[str, bytes]) -> None:
+        """Write the buffers of a stove."""
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO history (serial, tier, data) VALUES (?, ?, ?)",
+                [(serial, tier, data) for tier, data in buffers.items()],
+            )
+
+
+def _as_float(value: float | int | str | None) -> float:
+    """Return a value as float, NaN if it is missing or not numeric."""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
@@ -0,0 +1,172 @@
+"""Socket and poll scheduler shared by all configured stoves."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import DEFAULT_HISTORY_SAVE_INTERVAL, DEFAULT_POLL_STAGGER, DOMAIN
+from .history import AduroHistoryStore
+from .transport import AduroTransport
+
+if TYPE_CHECKING:
+    from .coordinator import AduroDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HUB = f"{DOMAIN}_hub"
+
+
+class AduroHub:
+    """Poll every configured stove over one socket from one timer.
+
+    Coordinators have no timer of their own. The hub keeps the time of the
+    next poll per stove, at least DEFAULT_POLL_STAGGER seconds apart, and
+    arms a single timer for the earliest one.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.transport = AduroTransport()
+        self.history_store = AduroHistoryStore(hass)
+        self.coordinators: dict[str, AduroDataUpdateCoordinator] = {}
+        self._next_poll: dict[str, float] = {}
+        self._refreshing: set[str] = set()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_save: CALLBACK_TYPE | None = None
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_save_history)
+
+    async def async_load_history(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Restore the stored history of a stove."""
+        coordinator.history.load(
+            await self.history_store.async_load(coordinator.stove_serial)
+        )
+
+    @callback
+    def async_add(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Start polling a stove."""
+        self.coordinators[coordinator.stove_serial] = coordinator
+        if self._unsub_save is None:
+            self._unsub_save = async_track_time_interval(
+                self.hass, self._async_save_history, DEFAULT_HISTORY_SAVE_INTERVAL
+            )
+        self.async_schedule(coordinator)
+
+    async def async_remove(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Stop polling a stove, closing the socket after the last one."""
+        if self.coordinators.pop(coordinator.stove_serial, None) is not None:
+            await self.history_store.async_save(
+                coordinator.stove_serial, coordinator.history.dump()
+            )
+        self._next_poll.pop(coordinator.stove_serial, None)
+        if self.coordinators:
+            self._async_arm_timer()
+            return
+        self._async_cancel_timer()
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+        await self.transport.async_close()
+
+    async def _async_save_history(self, _now: datetime | Event | None = None) -> None:
+        """Write the history of every stove to disk."""
+        for serial, coordinator in list(self.coordinators.items()):
+            await self.history_store.async_save(serial, coordinator.history.dump())
+
+    @callback
+    def async_get_coordinator(
+        self, serial: str | None = None, device_id: str | None = None
+    ) -> AduroDataUpdateCoordinator | None:
+        """Return the coordinator of a stove by serial or device id."""
+        if device_id is not None:
+            device = dr.async_get(self.hass).async_get(device_id)
+            if device is None:
+                return None
+            serial = next(
+                (value for domain, value in device.identifiers if domain == DOMAIN),
+                None,
+            )
+        if serial is None:
+            return None
+        return self.coordinators.get(serial.strip())
+
+    @callback
+    def async_schedule(
+        self, coordinator: AduroDataUpdateCoordinator, delay: float | None = None
+    ) -> None:
+        """Schedule the next poll of a stove, by default after its poll interval.
+
+        A stove being refreshed by the hub is scheduled when it finishes.
+        """
+        serial = coordinator.stove_serial
+        if serial not in self.coordinators or serial in self._refreshing:
+            return
+        if delay is None:
+            delay = coordinator.poll_interval.total_seconds()
+        self._next_poll[serial] = self._free_slot(serial, self.hass.loop.time() + delay)
+        self._async_arm_timer()
+
+    def _free_slot(self, serial: str, when: float) -> float:
+        """Move a poll time until no other stove is polled close to it."""
+        for other in sorted(
+            next_poll
+            for other_serial, next_poll in self._next_poll.items()
+            if other_serial != serial
+        ):
+            if abs(other - when) < DEFAULT_POLL_STAGGER:
+                when = other + DEFAULT_POLL_STAGGER
+        return when
+
+    @callback
+    def _async_arm_timer(self) -> None:
+        """Arm the timer for the earliest scheduled poll."""
+        self._async_cancel_timer()
+        if not self._next_poll:
+            return
+        delay = max(0.0, min(self._next_poll.values()) - self.hass.loop.time())
+        self._unsub_timer = async_call_later(self.hass, delay, self._async_poll_due)
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the poll timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_poll_due(self, _now: datetime) -> None:
+        """Refresh every stove whose poll time has come."""
+        self._unsub_timer = None
+        now = self.hass.loop.time()
+        for serial, next_poll in list(self._next_poll.items()):
+            if next_poll > now:
+                continue
+            del self._next_poll[serial]
+            self._refreshing.add(serial)
+            self.hass.async_create_background_task(
+                self._async_refresh(self.coordinators[serial]),
+                f"{DOMAIN} refresh {serial}",
+            )
+        self._async_arm_timer()
+
+    async def _async_refresh(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Refresh one stove and schedule its next poll."""
+        try:
+            await coordinator.async_refresh()
+        finally:
+            self._refreshing.discard(coordinator.stove_serial)
+            self.async_schedule(coordinator)
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> AduroHub:
+    """Return the hub shared by all config entries."""
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = AduroHub(hass)
+    return hub
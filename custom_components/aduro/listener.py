@@ -0,0 +1,81 @@
+"""Background state listener for the opt-in push mode."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, ENDPOINT_LOCAL, POLL_GROUP_STATUS
+
+if TYPE_CHECKING:
+    from .coordinator import AduroDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AduroStateListener:
+    """Probe the state of a stove between polls.
+
+    The stove cannot push changes, so the listener asks for its state and
+    substate every few seconds over the shared socket and has the hub refresh the
+    stove as soon as it differs from the last refreshed status. Probes
+    are only sent while the stove answers on the LAN and no refresh read
+    the state within the interval; the cloud relay is left to the normal
+    polls, and none are sent while the circuit breaker of the stove is
+    open.
+    """
+
+    def __init__(
+        self, coordinator: AduroDataUpdateCoordinator, interval: timedelta
+    ) -> None:
+        """Initialize the listener."""
+        self.coordinator = coordinator
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start probing in the background."""
+        if self._task is None:
+            self._task = self.coordinator.entry.async_create_background_task(
+                self.coordinator.hass,
+                self._async_run(),
+                f"{DOMAIN} listener {self.coordinator.stove_serial}",
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self) -> None:
+        """Probe the stove until stopped."""
+        coordinator = self.coordinator
+        while True:
+            await asyncio.sleep(self.interval.total_seconds())
+            if (
+                coordinator.breaker.is_open
+                or coordinator.connection.endpoint.name != ENDPOINT_LOCAL
+            ):
+                continue
+            status = coordinator.status
+            updated = coordinator.last_fetched(POLL_GROUP_STATUS)
+            if status is None or updated is None or dt_util.now() - updated < self.interval:
+                continue
+            if (probed := await coordinator.async_probe_state()) is None:
+                continue
+            if probed != (status.state, status.substate):
+                _LOGGER.debug(
+                    "Stove %s changed from state %s/%s to %s/%s, refreshing",
+                    coordinator.stove_serial,
+                    status.state,
+                    status.substate,
+                    *probed,
+                )
+                coordinator.hub.async_schedule(coordinator, 0)
@@ -0,0 +1,138 @@
+"""Request and refresh metrics of one stove."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from .transport import (
+    FUNCTION_DISCOVER,
+    FUNCTION_GET_OPERATING,
+    FUNCTION_GET_SETTINGS,
+    FUNCTION_GET_STATUS,
+    FUNCTION_SET_SETTINGS,
+)
+
+# Upper bounds (ms) of the latency histogram buckets; slower requests are
+# counted in one more bucket
+LATENCY_BUCKETS = (25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+REQUEST_DISCOVER = "discover"
+REQUEST_STATUS = "status"
+REQUEST_NETWORK = "network"
+REQUEST_SET = "set"
+REQUEST_PROBE = "probe"
+
+
+def request_type(function_id: int, payload: str) -> str:
+    """Return the name requests are grouped by in the metrics."""
+    if function_id == FUNCTION_GET_STATUS:
+        return REQUEST_STATUS
+    if function_id == FUNCTION_SET_SETTINGS:
+        return REQUEST_SET
+    if function_id == FUNCTION_DISCOVER:
+        return REQUEST_DISCOVER
+    if function_id == FUNCTION_GET_OPERATING:
+        return REQUEST_PROBE
+    if function_id == FUNCTION_GET_SETTINGS and payload == "wifi.router":
+        return REQUEST_NETWORK
+    return payload
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    """Latency histogram and failure counts of one request type."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    last: float | None = None
+    max: float = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the round trip time (ms) of a request that was answered."""
+        index = next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS) if latency <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        self.buckets[index] += 1
+        self.count += 1
+        self.last = latency
+        self.max = max(self.max, latency)
+
+    def quantile(self, share: float) -> float | None:
+        """Return the bucket bound below which the share of requests fell."""
+        if not self.count:
+            return None
+        wanted = share * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= wanted:
+                return float(min(bound, self.max))
+        return float(self.max)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the figures for attributes and diagnostics."""
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "last": None if self.last is None else round(self.last, 1),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 1),
+            "histogram": {
+                f"<={bound}": count for bound, count in zip(LATENCY_BUCKETS, self.buckets)
+            }
+            | {f">{LATENCY_BUCKETS[-1]}": self.buckets[-1]},
+        }
+
+
+@dataclass(slots=True)
+class AduroMetrics:
+    """Requests, endpoints and refreshes of one stove since setup."""
+
+    requests: dict[str, RequestMetrics] = field(default_factory=dict)
+    retries: int = 0
+    endpoints: dict[str, int] = field(default_factory=dict)
+    last_endpoint: str | None = None
+    refreshes: int = 0
+    failed_refreshes: int = 0
+    last_refresh: float | None = None
+
+    def request(self, name: str) -> RequestMetrics:
+        """Return the metrics of a request type."""
+        if (metrics := self.requests.get(name)) is None:
+            metrics = self.requests[name] = RequestMetrics()
+        return metrics
+
+    @property
+    def timeouts(self) -> int:
+        """Return the number of requests that timed out."""
+        return sum(metrics.timeouts for metrics in self.requests.values())
+
+    def record_endpoint(self, name: str) -> None:
+        """Record that a request was sent to an endpoint."""
+        self.endpoints[name] = self.endpoints.get(name, 0) + 1
+        self.last_endpoint = name
+
+    def record_refresh(self, duration: float, success: bool) -> None:
+        """Record how long (ms) a refresh took."""
+        self.refreshes += 1
+        if not success:
+            self.failed_refreshes += 1
+        self.last_refresh = duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all figures for diagnostics."""
+        return {
+            "requests": {name: metrics.as_dict() for name, metrics in self.requests.items()},
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "endpoints": dict(self.endpoints),
+            "last_endpoint": self.last_endpoint,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "last_refresh": None if self.last_refresh is None else round(self.last_refresh, 1),
+        }
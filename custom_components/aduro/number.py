@@ -8,15 +8,10 @@ from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import (
-    DEFAULT_CAPACITY_PELLETS,
-    DEFAULT_NOTIFICATION_LEVEL,
-    DEFAULT_SHUTDOWN_LEVEL,
-    DOMAIN,
-)
+
+from .const import DOMAIN
 from .coordinator import AduroDataUpdateCoordinator
+from .entity import AduroEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,7 +33,7 @@ async def async_setup_entry(
     ])
 
 
-class AduroHeatLevelNumber(CoordinatorEntity[AduroDataUpdateCoordinator], NumberEntity):
+class AduroHeatLevelNumber(AduroEntity, NumberEntity):
     """Number entity for heat level control."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -55,18 +50,16 @@ class AduroHeatLevelNumber(CoordinatorEntity[AduroDataUpdateCoordinator], Number
     @property
     def native_value(self) -> float | None:
         """Return the current heat level."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            from .const import HEAT_LEVEL_POWER_MAP
-            power = self.coordinator.data["status"].get("regulation.fixed_power", 50)
-            return HEAT_LEVEL_POWER_MAP.get(int(power), 2)
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.heatlevel
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the heat level."""
         await self.coordinator.async_set_heatlevel(int(value))
 
 
-class AduroBoilerRefNumber(CoordinatorEntity[AduroDataUpdateCoordinator], NumberEntity):
+class AduroBoilerRefNumber(AduroEntity, NumberEntity):
     """Number entity for boiler reference temperature."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -84,16 +77,16 @@ class AduroBoilerRefNumber(CoordinatorEntity[AduroDataUpdateCoordinator], Number
     @property
     def native_value(self) -> float | None:
         """Return the current boiler reference temperature."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            return self.coordinator.data["status"].get("boiler.temp", 20)
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.boiler_ref
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the boiler reference temperature."""
         await self.coordinator.async_set_temperature(int(value))
 
 
-class AduroCapacityPelletsNumber(CoordinatorEntity[AduroDataUpdateCoordinator], NumberEntity):
+class AduroCapacityPelletsNumber(AduroEntity, NumberEntity):
     """Number entity for pellet capacity setting."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -107,20 +100,19 @@ class AduroCapacityPelletsNumber(CoordinatorEntity[AduroDataUpdateCoordinator],
         self._attr_native_step = 0.1
         self._attr_native_unit_of_measurement = "kg"
         self._attr_mode = NumberMode.BOX
-        self._value = DEFAULT_CAPACITY_PELLETS
 
     @property
     def native_value(self) -> float:
         """Return the pellet capacity."""
-        return self._value
+        return self.coordinator.pellets.capacity
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the pellet capacity."""
-        self._value = value
-        self.async_write_ha_state()
+        self.coordinator.pellets.set_setting("capacity", value)
+        self.coordinator.async_update_listeners()
 
 
-class AduroNotificationLevelNumber(CoordinatorEntity[AduroDataUpdateCoordinator], NumberEntity):
+class AduroNotificationLevelNumber(AduroEntity, NumberEntity):
     """Number entity for notification pellet level."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -134,20 +126,19 @@ class AduroNotificationLevelNumber(CoordinatorEntity[AduroDataUpdateCoordinator]
         self._attr_native_step = 1
         self._attr_native_unit_of_measurement = "%"
         self._attr_mode = NumberMode.BOX
-        self._value = DEFAULT_NOTIFICATION_LEVEL
 
     @property
     def native_value(self) -> float:
         """Return the notification level."""
-        return self._value
+        return self.coordinator.pellets.notification_level
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the notification level."""
-        self._value = value
-        self.async_write_ha_state()
+        self.coordinator.pellets.set_setting("notification_level", value)
+        self.coordinator.async_update_listeners()
 
 
-class AduroShutdownLevelNumber(CoordinatorEntity[AduroDataUpdateCoordinator], NumberEntity):
+class AduroShutdownLevelNumber(AduroEntity, NumberEntity):
     """Number entity for shutdown pellet level."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -161,14 +152,13 @@ class AduroShutdownLevelNumber(CoordinatorEntity[AduroDataUpdateCoordinator], Nu
         self._attr_native_step = 1
         self._attr_native_unit_of_measurement = "%"
         self._attr_mode = NumberMode.BOX
-        self._value = DEFAULT_SHUTDOWN_LEVEL
 
     @property
     def native_value(self) -> float:
         """Return the shutdown level."""
-        return self._value
+        return self.coordinator.pellets.shutdown_level
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the shutdown level."""
-        self._value = value
-        self.async_write_ha_state()
+        self.coordinator.pellets.set_setting("shutdown_level", value)
+        self.coordinator.async_update_listeners()
@@ -0,0 +1,117 @@
+"""Pellet level of an Aduro stove, tracked from its daily consumption."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DEFAULT_CAPACITY_PELLETS,
+    DEFAULT_NOTIFICATION_LEVEL,
+    DEFAULT_SHUTDOWN_LEVEL,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+class AduroPelletTracker:
+    """Pellets left in the hopper since the last refill.
+
+    The stove's consumption of the day only grows until it resets at
+    midnight. Every reading adds its increase to the amount consumed since
+    the refill; a reading lower than the previous one is a reset and
+    counts in full.
+    """
+
+    def __init__(self, hass: HomeAssistant, serial: str) -> None:
+        """Initialize the tracker."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.pellets_{serial}"
+        )
+        self.capacity = DEFAULT_CAPACITY_PELLETS
+        self.notification_level: float = DEFAULT_NOTIFICATION_LEVEL
+        self.shutdown_level: float = DEFAULT_SHUTDOWN_LEVEL
+        self.consumed = 0.0
+        self.refills = 0
+        self._last_day: float | None = None
+
+    @property
+    def level(self) -> float:
+        """Return the pellets left in kg."""
+        return round(self.capacity - self.consumed, 1)
+
+    @property
+    def percentage(self) -> int | None:
+        """Return the pellets left as percentage of the capacity."""
+        if self.capacity <= 0:
+            return None
+        return round((self.capacity - self.consumed) / self.capacity * 100)
+
+    @property
+    def below_notification_level(self) -> bool:
+        """Return True once the level drops below the notification level."""
+        percentage = self.percentage
+        return percentage is not None and percentage < self.notification_level
+
+    @property
+    def below_shutdown_level(self) -> bool:
+        """Return True once the level drops below the shutdown level."""
+        percentage = self.percentage
+        return percentage is not None and percentage < self.shutdown_level
+
+    async def async_load(self) -> None:
+        """Restore the stored state."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.capacity = data.get("capacity", self.capacity)
+        self.notification_level = data.get("notification_level", self.notification_level)
+        self.shutdown_level = data.get("shutdown_level", self.shutdown_level)
+        self.consumed = data.get("consumed", self.consumed)
+        self.refills = data.get("refills", self.refills)
+        self._last_day = data.get("last_day")
+
+    def update(self, day: float) -> None:
+        """Add the consumption since the previous reading of the day counter."""
+        if self._last_day is not None:
+            increase = day - self._last_day if day >= self._last_day else day
+            self.consumed = round(self.consumed + increase, 3)
+        if day != self._last_day:
+            self._last_day = day
+            self._async_save()
+
+    def refill(self) -> None:
+        """Mark the hopper as full."""
+        self.consumed = 0.0
+        self.refills += 1
+        self._async_save()
+
+    def clean(self) -> None:
+        """Reset the number of refills after cleaning the stove."""
+        self.refills = 0
+        self._async_save()
+
+    def set_setting(self, name: str, value: float) -> None:
+        """Set the capacity, notification level or shutdown level."""
+        setattr(self, name, value)
+        self._async_save()
+
+    def _async_save(self) -> None:
+        """Schedule writing the state to disk."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the state to store."""
+        return {
+            "capacity": self.capacity,
+            "notification_level": self.notification_level,
+            "shutdown_level": self.shutdown_level,
+            "consumed": self.consumed,
+            "refills": self.refills,
+            "last_day": self._last_day,
+        }
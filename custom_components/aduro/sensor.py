@@ -1,6 +1,7 @@
 """Sensor platform for Aduro Hybrid Stove."""
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 import logging
 from typing import Any
 
@@ -11,17 +12,30 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
     UnitOfMass,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
     PERCENTAGE,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import DOMAIN, STATE_NAMES, SUBSTATE_NAMES, HEAT_LEVEL_POWER_MAP
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.translation import async_get_translations
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    ENDPOINT_CLOUD,
+    ENDPOINT_LOCAL,
+    REQUEST_TYPES,
+    TIMER_STARTUP_1,
+    TIMER_STARTUP_2,
+)
 from .coordinator import AduroDataUpdateCoordinator
+from .entity import AduroEntity
+from .status import STATUS_MAIN_OPTIONS, STATUS_SUB_OPTIONS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,6 +47,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up Aduro sensors from config entry."""
     coordinator: AduroDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    status_texts = await _async_get_status_texts(hass)
     
     sensors = [
         # Temperature sensors
@@ -44,8 +59,10 @@ async def async_setup_entry(
         AduroPowerSensor(coordinator),
         
         # State sensors
-        AduroStateSensor(coordinator),
-        AduroSubstateSensor(coordinator),
+        AduroStateSensor(coordinator, status_texts["status_main"]),
+        AduroSubstateSensor(coordinator, status_texts["status_sub"]),
+        AduroStatusSensor(coordinator, "status_main", "Status", STATUS_MAIN_OPTIONS),
+        AduroStatusSensor(coordinator, "status_sub", "Status Detail", STATUS_SUB_OPTIONS),
         AduroOperationModeSensor(coordinator),
         
         # Consumption sensors
@@ -62,12 +79,41 @@ async def async_setup_entry(
         AduroOxygenSensor(coordinator),
         AduroHeatLevelDisplaySensor(coordinator),
         AduroStoveIPSensor(coordinator),
+        
+        # Ignition countdowns
+        AduroIgnitionTimerSensor(coordinator, "2", TIMER_STARTUP_1, "timer_startup_1", "Ignition 1"),
+        AduroIgnitionTimerSensor(coordinator, "4", TIMER_STARTUP_2, "timer_startup_2", "Ignition 2"),
+        
+        # Diagnostics of the connection to the stove
+        AduroRefreshDurationSensor(coordinator),
+        AduroEndpointSensor(coordinator),
+        AduroRequestCounterSensor(coordinator, "timeouts", "Request Timeouts"),
+        AduroRequestCounterSensor(coordinator, "retries", "Request Retries"),
+        *(AduroRequestLatencySensor(coordinator, request) for request in REQUEST_TYPES),
     ]
     
     async_add_entities(sensors)
 
 
-class AduroTemperatureSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+async def _async_get_status_texts(hass: HomeAssistant) -> dict[str, dict[str, str]]:
+    """Return the translated text of every status sensor option.
+
+    Built once per setup in the configured language; the status sensors
+    only hand out option keys.
+    """
+    translations = await async_get_translations(
+        hass, hass.config.language, "entity", {DOMAIN}
+    )
+    texts: dict[str, dict[str, str]] = {"status_main": {}, "status_sub": {}}
+    for key, options in texts.items():
+        prefix = f"component.{DOMAIN}.entity.sensor.{key}.state."
+        for translation_key, text in translations.items():
+            if translation_key.startswith(prefix):
+                options[translation_key.removeprefix(prefix)] = text
+    return texts
+
+
+class AduroTemperatureSensor(AduroEntity, SensorEntity):
     """Temperature sensor for Aduro stove."""
 
     def __init__(
@@ -88,14 +134,12 @@ class AduroTemperatureSensor(CoordinatorEntity[AduroDataUpdateCoordinator], Sens
     @property
     def native_value(self) -> float | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            value = self.coordinator.data["status"].get(self._sensor_key)
-            if value is not None:
-                return round(float(value), 1)
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return getattr(status, self._sensor_key)
 
 
-class AduroPowerSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroPowerSensor(AduroEntity, SensorEntity):
     """Power sensor for Aduro stove."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -110,19 +154,20 @@ class AduroPowerSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEnti
     @property
     def native_value(self) -> float | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            value = self.coordinator.data["status"].get("power_kw")
-            if value is not None:
-                return round(float(value), 1)
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.power_kw
 
 
-class AduroStateSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroStateSensor(AduroEntity, SensorEntity):
     """State sensor for Aduro stove."""
 
-    def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
+    def __init__(
+        self, coordinator: AduroDataUpdateCoordinator, status_texts: dict[str, str]
+    ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
+        self._status_texts = status_texts
         self._attr_name = "Aduro State"
         self._attr_unique_id = f"{coordinator.stove_serial}_state"
         self._attr_icon = "mdi:information"
@@ -130,37 +175,29 @@ class AduroStateSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEnti
     @property
     def native_value(self) -> str | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            state = str(self.coordinator.data["status"].get("state", ""))
-            if state:
-                return state
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.state or None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            state = str(self.coordinator.data["status"].get("state", ""))
-            heatlevel = self._get_heatlevel_display()
-            state_text = STATE_NAMES.get(state, state).format(heatlevel=heatlevel)
-            return {"state_text": state_text}
-        return {}
+        if (status := self.coordinator.status) is None:
+            return {}
+        return {
+            "state_text": self._status_texts.get(status.status_main, status.status_main)
+        }
 
-    def _get_heatlevel_display(self) -> str:
-        """Get heat level display."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            power = self.coordinator.data["status"].get("regulation.fixed_power", 50)
-            level = HEAT_LEVEL_POWER_MAP.get(int(power), 2)
-            return ["", "I", "II", "III"][level]
-        return ""
 
-
-class AduroSubstateSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroSubstateSensor(AduroEntity, SensorEntity):
     """Substate sensor for Aduro stove."""
 
-    def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
+    def __init__(
+        self, coordinator: AduroDataUpdateCoordinator, status_texts: dict[str, str]
+    ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
+        self._status_texts = status_texts
         self._attr_name = "Aduro Substate"
         self._attr_unique_id = f"{coordinator.stove_serial}_substate"
         self._attr_icon = "mdi:information-outline"
@@ -168,26 +205,49 @@ class AduroSubstateSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorE
     @property
     def native_value(self) -> str | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            return str(self.coordinator.data["status"].get("substate", ""))
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.substate
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            state = str(self.coordinator.data["status"].get("state", ""))
-            substate = str(self.coordinator.data["status"].get("substate", ""))
-            
-            # Try to find specific substate text
-            substate_key = f"{state}_{substate}"
-            substate_text = SUBSTATE_NAMES.get(substate_key, SUBSTATE_NAMES.get(state, substate))
-            
-            return {"substate_text": substate_text}
-        return {}
+        if (status := self.coordinator.status) is None:
+            return {}
+        return {
+            "substate_text": self._status_texts.get(status.status_sub, status.status_sub)
+        }
+
+
+class AduroStatusSensor(AduroEntity, SensorEntity):
+    """Stove status as text, translated from the state, substate and heat level."""
+
+    def __init__(
+        self,
+        coordinator: AduroDataUpdateCoordinator,
+        sensor_key: str,
+        sensor_name: str,
+        options: list[str],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._sensor_key = sensor_key
+        self._attr_name = f"Aduro {sensor_name}"
+        self._attr_unique_id = f"{coordinator.stove_serial}_{sensor_key}"
+        self._attr_translation_key = sensor_key
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = options
+        self._attr_icon = "mdi:information"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the option key of the current status."""
+        if (status := self.coordinator.status) is None:
+            return None
+        return getattr(status, self._sensor_key)
 
 
-class AduroOperationModeSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroOperationModeSensor(AduroEntity, SensorEntity):
     """Operation mode sensor for Aduro stove."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -199,17 +259,16 @@ class AduroOperationModeSensor(CoordinatorEntity[AduroDataUpdateCoordinator], Se
     @property
     def native_value(self) -> str | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            mode = self.coordinator.data["status"].get("regulation.operation_mode", 0)
-            mode_map = {0: "Heat Level", 1: "Temperature", 2: "Wood"}
-            return mode_map.get(int(mode), "Unknown")
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        mode_map = {0: "Heat Level", 1: "Temperature", 2: "Wood"}
+        return mode_map.get(status.operation_mode or 0, "Unknown")
 
     @property
     def icon(self) -> str:
         """Return the icon based on mode."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            mode = self.coordinator.data["status"].get("regulation.operation_mode", 0)
+        if (status := self.coordinator.status) is not None:
+            mode = status.operation_mode or 0
             if mode == 0:
                 return "mdi:fire"
             elif mode == 1:
@@ -219,7 +278,7 @@ class AduroOperationModeSensor(CoordinatorEntity[AduroDataUpdateCoordinator], Se
         return "mdi:help-circle"
 
 
-class AduroConsumptionSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroConsumptionSensor(AduroEntity, SensorEntity):
     """Consumption sensor for Aduro stove."""
 
     def __init__(
@@ -247,7 +306,7 @@ class AduroConsumptionSensor(CoordinatorEntity[AduroDataUpdateCoordinator], Sens
         return None
 
 
-class AduroPelletLevelSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroPelletLevelSensor(AduroEntity, SensorEntity):
     """Pellet level sensor for Aduro stove."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -261,13 +320,20 @@ class AduroPelletLevelSensor(CoordinatorEntity[AduroDataUpdateCoordinator], Sens
 
     @property
     def native_value(self) -> float | None:
-        """Return the sensor value."""
-        # This would be calculated from capacity - consumption
-        # Placeholder implementation
-        return None
+        """Return the pellets left in the hopper."""
+        return self.coordinator.pellets.level
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the refill bookkeeping."""
+        pellets = self.coordinator.pellets
+        return {
+            "consumed_since_refill": round(pellets.consumed, 1),
+            "refills_since_cleaning": pellets.refills,
+        }
 
 
-class AduroPelletPercentageSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroPelletPercentageSensor(AduroEntity, SensorEntity):
     """Pellet percentage sensor for Aduro stove."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -281,13 +347,20 @@ class AduroPelletPercentageSensor(CoordinatorEntity[AduroDataUpdateCoordinator],
 
     @property
     def native_value(self) -> int | None:
-        """Return the sensor value."""
-        # This would be calculated from pellet level / capacity * 100
-        # Placeholder implementation
-        return None
+        """Return the pellets left as percentage of the capacity."""
+        return self.coordinator.pellets.percentage
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether the notification and shutdown levels are reached."""
+        pellets = self.coordinator.pellets
+        return {
+            "below_notification_level": pellets.below_notification_level,
+            "below_shutdown_level": pellets.below_shutdown_level,
+        }
 
 
-class AduroOxygenSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroOxygenSensor(AduroEntity, SensorEntity):
     """Oxygen sensor for Aduro stove."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -302,14 +375,12 @@ class AduroOxygenSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEnt
     @property
     def native_value(self) -> float | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            value = self.coordinator.data["status"].get("oxygen")
-            if value is not None:
-                return round(float(value), 1)
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.oxygen
 
 
-class AduroHeatLevelDisplaySensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroHeatLevelDisplaySensor(AduroEntity, SensorEntity):
     """Heat level display sensor for Aduro stove."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -322,14 +393,12 @@ class AduroHeatLevelDisplaySensor(CoordinatorEntity[AduroDataUpdateCoordinator],
     @property
     def native_value(self) -> str | None:
         """Return the sensor value."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            power = self.coordinator.data["status"].get("regulation.fixed_power", 50)
-            level = HEAT_LEVEL_POWER_MAP.get(int(power), 2)
-            return ["", "I", "II", "III"][level]
-        return None
+        if (status := self.coordinator.status) is None:
+            return None
+        return status.heatlevel_display
 
 
-class AduroStoveIPSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEntity):
+class AduroStoveIPSensor(AduroEntity, SensorEntity):
     """Stove IP address sensor."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -345,3 +414,199 @@ class AduroStoveIPSensor(CoordinatorEntity[AduroDataUpdateCoordinator], SensorEn
         if self.coordinator.data and "ip" in self.coordinator.data:
             return self.coordinator.data["ip"]
         return self.coordinator.stove_ip
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the stove's Wi-Fi network details."""
+        if self.coordinator.data and self.coordinator.data.get("network"):
+            return dict(self.coordinator.data["network"])
+        return {}
+
+
+class AduroIgnitionTimerSensor(AduroEntity, SensorEntity):
+    """Time at which an ignition phase of the stove is expected to end.
+
+    The end is set when the stove enters the ignition state and cleared
+    when it leaves it or the phase has run its course. One callback is
+    scheduled for the end of the phase; nothing runs while the stove is
+    not igniting.
+    """
+
+    def __init__(
+        self,
+        coordinator: AduroDataUpdateCoordinator,
+        ignition_state: str,
+        duration: int,
+        sensor_key: str,
+        sensor_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._ignition_state = ignition_state
+        self._duration = timedelta(seconds=duration)
+        self._attr_name = f"Aduro {sensor_name} Ends"
+        self._attr_unique_id = f"{coordinator.stove_serial}_{sensor_key}"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_icon = "mdi:timer-outline"
+        self._last_state: str | None = None
+        self._ends: datetime | None = None
+        self._unsub_expire: CALLBACK_TYPE | None = None
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the running ignition phase ends."""
+        return self._ends
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Start or stop the countdown on ignition state changes."""
+        status = self.coordinator.status
+        state = status.state if status else None
+        if state != self._last_state:
+            self._last_state = state
+            self._cancel_expire()
+            self._ends = None
+            if state == self._ignition_state:
+                self._ends = dt_util.utcnow() + self._duration
+                self._unsub_expire = async_call_later(
+                    self.hass, self._duration, self._async_expired
+                )
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_expired(self, _now: datetime) -> None:
+        """Clear the countdown once the ignition phase has run its course."""
+        self._unsub_expire = None
+        self._ends = None
+        self._async_write_if_changed()
+
+    @callback
+    def _cancel_expire(self) -> None:
+        """Cancel the scheduled end of the countdown."""
+        if self._unsub_expire is not None:
+            self._unsub_expire()
+            self._unsub_expire = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the scheduled end when the entity is removed."""
+        self._cancel_expire()
+        await super().async_will_remove_from_hass()
+
+
+class AduroMetricSensor(AduroEntity, SensorEntity):
+    """Diagnostic sensor reading the request metrics of the stove.
+
+    Stays available while refreshes fail, when its figures matter most.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are kept locally."""
+        return True
+
+
+class AduroRefreshDurationSensor(AduroMetricSensor):
+    """Duration of the last refresh of the stove."""
+
+    def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Aduro Refresh Duration"
+        self._attr_unique_id = f"{coordinator.stove_serial}_refresh_duration"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_icon = "mdi:timer-sand"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last refresh in ms."""
+        duration = self.coordinator.metrics.last_refresh
+        return None if duration is None else round(duration)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of failed refreshes."""
+        return {"failed_refreshes": self.coordinator.metrics.failed_refreshes}
+
+
+class AduroEndpointSensor(AduroMetricSensor):
+    """Endpoint the last request was sent to, the LAN or the cloud relay."""
+
+    def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Aduro Endpoint"
+        self._attr_unique_id = f"{coordinator.stove_serial}_endpoint"
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = [ENDPOINT_LOCAL, ENDPOINT_CLOUD]
+        self._attr_icon = "mdi:lan-connect"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the endpoint the last request was sent to."""
+        return self.coordinator.metrics.last_endpoint
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of requests sent to each endpoint."""
+        return dict(self.coordinator.metrics.endpoints)
+
+
+class AduroRequestCounterSensor(AduroMetricSensor):
+    """Number of timed out or retried requests since setup."""
+
+    def __init__(
+        self, coordinator: AduroDataUpdateCoordinator, counter: str, sensor_name: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._counter = counter
+        self._attr_name = f"Aduro {sensor_name}"
+        self._attr_unique_id = f"{coordinator.stove_serial}_request_{counter}"
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_icon = "mdi:counter"
+
+    @property
+    def native_value(self) -> int:
+        """Return the counter."""
+        return getattr(self.coordinator.metrics, self._counter)
+
+
+class AduroRequestLatencySensor(AduroMetricSensor):
+    """Latency of the last request of one type, with its histogram.
+
+    Disabled by default; enable the request types to look into.
+    """
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: AduroDataUpdateCoordinator, request: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._request = request
+        self._attr_name = f"Aduro Latency {request.replace('_', ' ').title()}"
+        self._attr_unique_id = f"{coordinator.stove_serial}_latency_{request}"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latency of the last answered request in ms."""
+        metrics = self.coordinator.metrics.requests.get(self._request)
+        if metrics is None or metrics.last is None:
+            return None
+        return round(metrics.last)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the counts, quantiles and histogram of the request type."""
+        if (metrics := self.coordinator.metrics.requests.get(self._request)) is None:
+            return {}
+        attributes = metrics.as_dict()
+        del attributes["last"]
+        return attributes
@@ -0,0 +1,149 @@
+"""Schema driven parser for the stove's status reply."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import logging
+
+from pyduro.actions import STATUS_PARAMS
+
+from .const import HEAT_LEVEL_POWER_MAP, STATUS_MAIN_KEYS, STATUS_SUB_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Field order of the function 11 ("*") reply
+STATUS_KEYS: tuple[str, ...] = tuple(STATUS_PARAMS)
+
+HEAT_LEVEL_DISPLAY = ("", "I", "II", "III")
+DEFAULT_HEAT_LEVEL = 2
+
+# (state, heat level) and (state, substate) to status sensor options,
+# expanded once so parsing is a dict lookup
+STATUS_MAIN_TABLE: dict[tuple[str, int], str] = {
+    (state, heatlevel): f"{key}_{heatlevel}" if key == "operating" else key
+    for state, key in STATUS_MAIN_KEYS.items()
+    for heatlevel in (1, 2, 3)
+}
+STATUS_SUB_TABLE: dict[tuple[str, str | None], str] = {
+    tuple(key.split("_", 1)) if "_" in key else (key, None): option
+    for key, option in STATUS_SUB_KEYS.items()
+}
+STATUS_MAIN_OPTIONS = sorted(set(STATUS_MAIN_TABLE.values()))
+STATUS_SUB_OPTIONS = sorted(set(STATUS_SUB_TABLE.values()))
+
+
+@dataclass(frozen=True, slots=True)
+class StatusField:
+    """One value of the status reply and how to convert it."""
+
+    name: str
+    key: str
+    type: type[float] | type[int] | type[str]
+    scale: float = 1.0
+
+
+STATUS_SCHEMA: tuple[StatusField, ...] = (
+    StatusField("boiler_temp", "boiler_temp", float),
+    StatusField("boiler_ref", "boiler_ref", float),
+    StatusField("state", "state", str),
+    StatusField("substate", "substate", str),
+    StatusField("substate_sec", "substate_sec", int),
+    StatusField("oxygen", "oxygen", float),
+    StatusField("power_kw", "power_kw", float),
+    StatusField("power_pct", "power_pct", float),
+    StatusField("shaft_temp", "shaft_temp", float),
+    StatusField("smoke_temp", "smoke_temp", float),
+    StatusField("fixed_power", "regulation.fixed_power", int),
+    StatusField("operation_mode", "operation_mode", int),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AduroStatus:
+    """Typed snapshot of one status reply.
+
+    Values are converted once when the reply is parsed; a value that is
+    missing from the reply or cannot be converted is None.
+    """
+
+    boiler_temp: float | None = None
+    boiler_ref: float | None = None
+    state: str | None = None
+    substate: str | None = None
+    substate_sec: int | None = None
+    oxygen: float | None = None
+    power_kw: float | None = None
+    power_pct: float | None = None
+    shaft_temp: float | None = None
+    smoke_temp: float | None = None
+    fixed_power: int | None = None
+    operation_mode: int | None = None
+    # Derived from the values above
+    heatlevel: int = DEFAULT_HEAT_LEVEL
+    heatlevel_display: str = HEAT_LEVEL_DISPLAY[DEFAULT_HEAT_LEVEL]
+    status_main: str | None = None
+    status_sub: str | None = None
+
+
+def _converter(status_field: StatusField) -> Callable[[str], float | int | str]:
+    """Return the function converting one raw value of a field."""
+    scale = status_field.scale
+    if status_field.type is str:
+        return str.strip
+    if status_field.type is int:
+        return lambda value: int(float(value) * scale)
+    return lambda value: round(float(value) * scale, 1)
+
+
+# (attribute, position in the reply, converter)
+CompiledSchema = tuple[tuple[str, int, Callable[[str], float | int | str]], ...]
+
+
+def compile_schema(names: Iterable[str] | None = None) -> CompiledSchema:
+    """Resolve the named fields, or all of them, to positions in the reply."""
+    wanted = None if names is None else set(names)
+    return tuple(
+        (status_field.name, STATUS_KEYS.index(status_field.key), _converter(status_field))
+        for status_field in STATUS_SCHEMA
+        if wanted is None or status_field.name in wanted
+    )
+
+
+FULL_SCHEMA = compile_schema()
+STATE_SCHEMA = compile_schema(("state", "substate"))
+
+
+def parse_status(payload: str, schema: CompiledSchema = FULL_SCHEMA) -> AduroStatus:
+    """Parse the payload of a status reply into a snapshot.
+
+    Fields left out of the schema are None; the reply is only split up to
+    the last position the schema reads.
+    """
+    last = max((index for _, index, _ in schema), default=-1)
+    values = payload.split(",", last + 1)
+    count = len(values)
+    parsed: dict[str, float | int | str | None] = {}
+    for name, index, convert in schema:
+        if index >= count:
+            parsed[name] = None
+            continue
+        try:
+            parsed[name] = convert(values[index])
+        except ValueError:
+            _LOGGER.debug("Ignoring invalid %s value: %r", name, values[index])
+            parsed[name] = None
+
+    heatlevel = HEAT_LEVEL_POWER_MAP.get(parsed.get("fixed_power"), DEFAULT_HEAT_LEVEL)
+    heatlevel_display = HEAT_LEVEL_DISPLAY[heatlevel]
+    state = parsed.get("state")
+    substate = parsed.get("substate")
+
+    return AduroStatus(
+        **parsed,
+        heatlevel=heatlevel,
+        heatlevel_display=heatlevel_display,
+        status_main=STATUS_MAIN_TABLE.get((state, heatlevel)),
+        status_sub=STATUS_SUB_TABLE.get(
+            (state, substate), STATUS_SUB_TABLE.get((state, None))
+        ),
+    )
@@ -8,10 +8,10 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, STARTUP_STATES
 from .coordinator import AduroDataUpdateCoordinator
+from .entity import AduroEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ async def async_setup_entry(
     async_add_entities([AduroStoveSwitch(coordinator)])
 
 
-class AduroStoveSwitch(CoordinatorEntity[AduroDataUpdateCoordinator], SwitchEntity):
+class AduroStoveSwitch(AduroEntity, SwitchEntity):
     """Representation of an Aduro stove on/off switch."""
 
     def __init__(self, coordinator: AduroDataUpdateCoordinator) -> None:
@@ -40,10 +40,9 @@ class AduroStoveSwitch(CoordinatorEntity[AduroDataUpdateCoordinator], SwitchEnti
     @property
     def is_on(self) -> bool:
         """Return true if stove is on."""
-        if self.coordinator.data and "status" in self.coordinator.data:
-            state = str(self.coordinator.data["status"].get("state", ""))
-            return state in STARTUP_STATES
-        return False
+        if (status := self.coordinator.status) is None:
+            return False
+        return status.state in STARTUP_STATES
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the stove on."""
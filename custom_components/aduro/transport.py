@@ -0,0 +1,470 @@
+"""Asyncio UDP transport for the NBE protocol spoken by Aduro stoves."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import itertools
+import logging
+import random
+import socket
+import time
+from typing import TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+NBE_PORT = 8483
+NBE_BROADCAST_ADDRESS = "255.255.255.255"
+NBE_APP_ID = "homeassistant"
+NBE_ENCRYPTION_NONE = " "
+NBE_FRAME_START = "\x02"
+NBE_FRAME_END = "\x04"
+NBE_DISCOVERY_PAYLOAD = "NBE Discovery"
+NBE_ENCODING = "latin-1"
+
+# Function ids, same numbering as pyduro.protocol.FUNCTIONS
+FUNCTION_DISCOVER = 0
+FUNCTION_GET_SETTINGS = 1
+FUNCTION_SET_SETTINGS = 2
+FUNCTION_GET_OPERATING = 4
+FUNCTION_GET_CONSUMPTION = 6
+FUNCTION_GET_STATUS = 11
+
+DEFAULT_REQUEST_TIMEOUT = 5.0
+DEFAULT_DISCOVERY_TIMEOUT = 3.0
+
+_T = TypeVar("_T")
+
+# Response header: app id (12), serial (6), STX, function (2), sequence (2),
+# status (1), payload size (3)
+_RESPONSE_HEADER_SIZE = 12 + 6 + 1 + 2 + 2 + 1 + 3
+
+
+@dataclass(frozen=True, slots=True)
+class AduroResponse:
+    """A response frame received from a stove."""
+
+    serial: str
+    function_id: int
+    sequence: int
+    status: int
+    payload: str
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How requests that got no answer are retried.
+
+    Every attempt has its own timeout; retries wait an exponentially
+    growing delay, of which a random part is dropped so stoves polled at
+    the same time do not retry in lockstep. The stove's address should
+    only be discovered again after rediscover_after failures in a row
+    against the same endpoint.
+    """
+
+    timeout: float = 2.0
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    rediscover_after: int = 3
+
+    def delay(self, retry: int) -> float:
+        """Return the seconds to wait before a retry, the first being 1."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class RetryBudget:
+    """Retries shared by all requests of one refresh.
+
+    Bounds the extra traffic of a refresh against a stove that stopped
+    answering, however many requests it makes.
+    """
+
+    def __init__(self, retries: int) -> None:
+        """Initialize the budget."""
+        self.remaining = retries
+
+    def take(self) -> bool:
+        """Use one retry, returning False if none are left."""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+async def async_retry(
+    request: Callable[[int, float], Awaitable[_T]],
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    budget: RetryBudget | None = None,
+) -> _T:
+    """Await request(attempt, timeout) until it succeeds or retries run out.
+
+    Requests the stove rejected are not retried, the answer would not
+    change.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await request(attempt, policy.timeout)
+        except AduroResponseError:
+            raise
+        except AduroTransportError as err:
+            attempt += 1
+            if attempt >= policy.attempts or (budget is not None and not budget.take()):
+                raise
+            delay = policy.delay(attempt)
+            _LOGGER.debug("Request failed (%s), retry %d in %.2f s", err, attempt, delay)
+            await asyncio.sleep(delay)
+
+
+def build_request_frame(
+    serial: str,
+    pin_code: str,
+    function_id: int,
+    sequence: int,
+    payload: str,
+) -> bytes:
+    """Build a request frame in the format used by pyduro."""
+    frame = (
+        f"{NBE_APP_ID:_<12.12}"
+        f"{normalize_serial(serial)}"
+        f"{NBE_ENCRYPTION_NONE}"
+        f"{NBE_FRAME_START}"
+        f"{function_id:02d}"
+        f"{sequence:02d}"
+        f"{pin_code:0<10.10}"
+        f"{int(time.time()):010d}"
+        "pad "
+        f"{len(payload):03d}"
+        f"{payload}"
+        f"{NBE_FRAME_END}"
+    )
+    return frame.encode(NBE_ENCODING)
+
+
+def parse_response_frame(data: bytes) -> AduroResponse:
+    """Parse a response frame, raising ValueError if it is malformed.
+
+    Like pyduro, the byte between the serial and the function is skipped
+    without checking that it is the frame start.
+    """
+    frame = data.decode(NBE_ENCODING)
+    if len(frame) < _RESPONSE_HEADER_SIZE:
+        raise ValueError(f"Malformed NBE frame: {frame!r}")
+
+    payload_size = int(frame[24:27])
+    payload = frame[27:27 + payload_size]
+    if len(payload) != payload_size:
+        raise ValueError(f"Truncated NBE frame: {frame!r}")
+
+    return AduroResponse(
+        serial=frame[12:18],
+        function_id=int(frame[19:21]),
+        sequence=int(frame[21:23]),
+        status=int(frame[23:24]),
+        payload=payload,
+    )
+
+
+def normalize_serial(serial: str) -> str:
+    """Return the serial as sent on the wire, left padded with zeros."""
+    return f"{serial:0>6.6}"
+
+
+def parse_discovery_payload(payload: str) -> dict[str, str]:
+    """Parse a discovery reply of semicolon separated key=value pairs."""
+    result = {}
+    for item in payload.split(";"):
+        key, sep, value = item.partition("=")
+        if sep:
+            result[key.strip()] = value.strip()
+    return result
+
+
+def parse_operating_value(payload: str, name: str) -> str | None:
+    """Return the value in the reply to a single operating value request.
+
+    The stove answers a request for "state" with "state=5"; None is
+    returned if the reply is not a value for the requested name.
+    """
+    key, sep, value = payload.partition("=")
+    if not sep or key.strip() != name:
+        return None
+    return value.strip()
+
+
+class AduroProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol matching stove responses to outstanding requests."""
+
+    def __init__(self) -> None:
+        """Initialize the protocol."""
+        self.transport: asyncio.DatagramTransport | None = None
+        self._pending: dict[tuple[str, int, int], asyncio.Future[AduroResponse]] = {}
+        self._discovery: list[tuple[str | None, asyncio.Future[dict[str, str]]]] = []
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport once the socket is ready."""
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Dispatch a received datagram to the waiting request."""
+        try:
+            response = parse_response_frame(data)
+        except ValueError as err:
+            _LOGGER.debug("Dropping datagram from %s: %s", addr, err)
+            return
+
+        if response.function_id == FUNCTION_DISCOVER:
+            self._handle_discovery(response, addr)
+            return
+
+        key = (response.serial, response.function_id, response.sequence)
+        future = self._pending.pop(key, None)
+        if future is None:
+            _LOGGER.debug("Dropping unsolicited frame from %s: %s", addr, key)
+            return
+        if not future.done():
+            future.set_result(response)
+
+    def error_received(self, exc: Exception) -> None:
+        """Log socket level errors, requests will time out on their own."""
+        _LOGGER.debug("Socket error on stove transport: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail all outstanding requests when the socket closes."""
+        error = exc or ConnectionError("Stove transport closed")
+        discovery = (future for _, future in self._discovery)
+        for future in itertools.chain(self._pending.values(), discovery):
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+        self._discovery.clear()
+        self.transport = None
+
+    def register(
+        self, key: tuple[str, int, int]
+    ) -> asyncio.Future[AduroResponse]:
+        """Register a future for the response matching key."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        return future
+
+    def unregister(self, key: tuple[str, int, int]) -> None:
+        """Forget an outstanding request."""
+        self._pending.pop(key, None)
+
+    def is_pending(self, key: tuple[str, int, int]) -> bool:
+        """Return True if a request with this key is outstanding."""
+        return key in self._pending
+
+    def register_discovery(
+        self, serial: str | None = None
+    ) -> asyncio.Future[dict[str, str]]:
+        """Register a future for the next discovery reply, from serial if given."""
+        future = asyncio.get_running_loop().create_future()
+        self._discovery.append((serial, future))
+        return future
+
+    def unregister_discovery(self, future: asyncio.Future[dict[str, str]]) -> None:
+        """Forget a discovery waiter."""
+        self._discovery = [
+            waiter for waiter in self._discovery if waiter[1] is not future
+        ]
+
+    def _handle_discovery(self, response: AduroResponse, addr: tuple[str, int]) -> None:
+        """Resolve discovery waiters with a discovery reply."""
+        reply = parse_discovery_payload(response.payload)
+        if not reply:
+            return
+        reply.setdefault("Serial", response.serial)
+        reply.setdefault("IP", addr[0])
+        serial = normalize_serial(reply["Serial"])
+        waiting = []
+        for wanted, future in self._discovery:
+            if wanted is not None and wanted != serial:
+                waiting.append((wanted, future))
+            elif not future.done():
+                future.set_result(reply)
+        self._discovery = waiting
+
+
+class AduroTransport:
+    """One UDP socket used for all requests to a stove."""
+
+    def __init__(self, port: int = NBE_PORT) -> None:
+        """Initialize the transport."""
+        self.port = port
+        self._protocol: AduroProtocol | None = None
+        self._start_lock = asyncio.Lock()
+        self._sequence = itertools.cycle(range(99))
+        self._addresses: dict[str, str] = {}
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the socket is open."""
+        return self._protocol is not None and self._protocol.transport is not None
+
+    async def async_start(self) -> None:
+        """Open the socket if it is not open yet."""
+        async with self._start_lock:
+            if self.connected:
+                return
+            loop = asyncio.get_running_loop()
+            _, protocol = await loop.create_datagram_endpoint(
+                AduroProtocol,
+                local_addr=("0.0.0.0", 0),
+                family=socket.AF_INET,
+                allow_broadcast=True,
+            )
+            self._protocol = protocol
+
+    async def async_close(self) -> None:
+        """Close the socket."""
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.close()
+        self._protocol = None
+
+    async def async_request(
+        self,
+        address: str,
+        serial: str,
+        pin_code: str,
+        function_id: int,
+        payload: str,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> AduroResponse:
+        """Send a request frame and wait for the matching response."""
+        await self.async_start()
+        assert self._protocol is not None and self._protocol.transport is not None
+        protocol = self._protocol
+
+        serial = normalize_serial(serial)
+        key = self._next_key(protocol, serial, function_id)
+        frame = build_request_frame(serial, pin_code, function_id, key[2], payload)
+        target = (await self._async_resolve(address), self.port)
+
+        future = protocol.register(key)
+        try:
+            protocol.transport.sendto(frame, target)
+            async with asyncio.timeout(timeout):
+                response = await future
+        except TimeoutError as err:
+            raise AduroTimeoutError(
+                f"No response from {address} for function {function_id}"
+            ) from err
+        finally:
+            protocol.unregister(key)
+
+        if response.status != 0:
+            raise AduroResponseError(
+                f"Stove returned status {response.status} for function {function_id}"
+            )
+        return response
+
+    async def async_request_retry(
+        self,
+        address: str,
+        serial: str,
+        pin_code: str,
+        function_id: int,
+        payload: str,
+        policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+        budget: RetryBudget | None = None,
+    ) -> AduroResponse:
+        """Send a request, retrying it according to the policy."""
+        return await async_retry(
+            lambda _attempt, timeout: self.async_request(
+                address, serial, pin_code, function_id, payload, timeout
+            ),
+            policy,
+            budget,
+        )
+
+    async def async_set(
+        self,
+        address: str,
+        serial: str,
+        pin_code: str,
+        path: str,
+        value: int | float | str,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> AduroResponse:
+        """Write a setting on the stove."""
+        return await self.async_request(
+            address,
+            serial,
+            pin_code,
+            FUNCTION_SET_SETTINGS,
+            f"{path}={value}",
+            timeout,
+        )
+
+    async def async_discover(
+        self,
+        timeout: float = DEFAULT_DISCOVERY_TIMEOUT,
+        serial: str | None = None,
+    ) -> dict[str, str]:
+        """Broadcast a discovery request and return the first reply.
+
+        With a serial, replies from other stoves on the network are ignored.
+        """
+        await self.async_start()
+        assert self._protocol is not None and self._protocol.transport is not None
+        protocol = self._protocol
+
+        future = protocol.register_discovery(
+            None if serial is None else normalize_serial(serial)
+        )
+        try:
+            protocol.transport.sendto(
+                build_request_frame(
+                    "<serial>", "<pin>", FUNCTION_DISCOVER, 0, NBE_DISCOVERY_PAYLOAD
+                ),
+                (NBE_BROADCAST_ADDRESS, self.port),
+            )
+            async with asyncio.timeout(timeout):
+                return await future
+        except TimeoutError as err:
+            stove = "No stove" if serial is None else f"Stove {serial}"
+            raise AduroTimeoutError(
+                f"{stove} did not answer the discovery broadcast"
+            ) from err
+        finally:
+            protocol.unregister_discovery(future)
+
+    def _next_key(
+        self, protocol: AduroProtocol, serial: str, function_id: int
+    ) -> tuple[str, int, int]:
+        """Return a request key whose sequence number is not in flight."""
+        for _ in range(99):
+            key = (serial, function_id, next(self._sequence))
+            if not protocol.is_pending(key):
+                return key
+        raise AduroTransportError("Too many outstanding requests")
+
+    async def _async_resolve(self, address: str) -> str:
+        """Resolve a host name once so sendto never blocks on DNS."""
+        if (resolved := self._addresses.get(address)) is not None:
+            return resolved
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            address, self.port, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+        resolved = infos[0][4][0]
+        self._addresses[address] = resolved
+        return resolved
+
+
+class AduroTransportError(Exception):
+    """Error to indicate a request to the stove failed."""
+
+
+class AduroTimeoutError(AduroTransportError):
+    """Error to indicate the stove did not answer in time."""
+
+
+class AduroResponseError(AduroTransportError):
+    """Error to indicate the stove rejected a request."""
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+# Benchmarks for the poll path, the status parser and the MQTT publish cycle.
+#
+# Runs against aduro_simulator.py and a minimal MQTT broker in a background
+# thread, so no stove, cloud relay or broker is needed:
+#
+#   parse     parse_status() of the integration and the dict(zip()) of the
+#             MQTT scripts on one status reply
+#   poll      the requests of one coordinator refresh over AduroTransport,
+#             status only and with every poll group due
+#   bridge    one status cycle of pyduro_mqtt_bridge.py, fetch and publish
+#   script    one "MODE: all" run of pyduro_mqtt.py including MQTT connect,
+#             publish and disconnect, as started by script.pyduro_mqtt_all
+#
+# Every benchmark reports p50/p95/p99 latency, UDP requests, bytes on the
+# wire (UDP and MQTT), threads and executor threads in use and the peak of
+# the memory traced during a cycle (asyncio allocates a 256 KiB buffer for
+# every datagram it receives, which dominates the figure of UDP cycles).
+#
+# usage:
+#   python3 aduro_benchmark.py                        # run and print
+#   python3 aduro_benchmark.py --save                 # store as baseline
+#   python3 aduro_benchmark.py --compare              # fail on regressions
+#
+# The baseline is python_scripts/benchmark_baseline.json unless --baseline
+# is given. Counters are per cycle after a few warm-up cycles, so the first
+# full MQTT snapshot is not spread over the cycles, and the simulator's
+# clock and random values are frozen for every benchmark: they only change
+# with the code. Latency depends on the machine; it is scaled by a fixed
+# calibration workload timed on both machines and compared with a wider
+# threshold.
+# The simulator listens on the NBE port 8483, which pyduro always sends to.
+# ------------------------------------------------------------------------------
+
+#---import
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+import statistics
+import struct
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+_LOGGER = logging.getLogger("aduro_benchmark")
+
+SCRIPTS_PATH = Path(__file__).resolve().parent
+INTEGRATION_PATH = SCRIPTS_PATH.parent / "custom_components" / "aduro"
+DEFAULT_BASELINE = SCRIPTS_PATH / "benchmark_baseline.json"
+
+SERIAL = "100000"
+PIN = "1234567890"
+BASE_PATH = "aduro_h2/"
+
+# Figures compared against the baseline; higher is worse for all of them
+COMPARED = ("p95_ms", "requests", "udp_bytes", "mqtt_bytes", "threads", "alloc_peak_kib")
+# Latency increases below this are noise, whatever the percentage
+LATENCY_NOISE_MS = 0.5
+# Cycles run before counting, they publish the first full snapshot
+WARMUP_CYCLES = 3
+SIMULATOR_SEED = 1
+# Baseline entry holding the calibration of the machine it was made on
+MACHINE_KEY = "_machine"
+CALIBRATION_ROUNDS = 30
+
+#-------------------------------------------------------------------------------
+# Load a script from this directory as a module
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_PATH / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Import modules of the integration without running its __init__.py, which
+# needs Home Assistant; only modules without Home Assistant imports work
+def load_integration_module(name):
+    if "aduro_integration" not in sys.modules:
+        package = types.ModuleType("aduro_integration")
+        package.__path__ = [str(INTEGRATION_PATH)]
+        sys.modules["aduro_integration"] = package
+    return importlib.import_module(f"aduro_integration.{name}")
+#-------------------------------------------------------------------------------
+
+
+class MiniBroker(asyncio.Protocol):
+    """Just enough of an MQTT 3.1.1 broker for the scripts to publish to.
+
+    Handles connect, publish (QoS 0-2), subscribe, ping and disconnect;
+    publishes are forwarded to subscribers of the exact topic or '#'.
+    """
+
+    stats = {"connections": 0, "publishes": 0, "bytes_in": 0, "bytes_out": 0}
+    sessions = set()
+
+    def __init__(self):
+        self.transport = None
+        self.buffer = b""
+        self.subscriptions = set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.stats["connections"] += 1
+        self.sessions.add(self)
+
+    def connection_lost(self, exc):
+        self.sessions.discard(self)
+
+    def data_received(self, data):
+        self.stats["bytes_in"] += len(data)
+        self.buffer += data
+        while (packet := self._next_packet()) is not None:
+            self._handle(*packet)
+
+    def _next_packet(self):
+        multiplier, length, position = 1, 0, 1
+        while True:
+            if position >= len(self.buffer):
+                return None
+            byte = self.buffer[position]
+            length += (byte & 0x7F) * multiplier
+            multiplier *= 128
+            position += 1
+            if not byte & 0x80:
+                break
+        if len(self.buffer) < position + length:
+            return None
+        header, body = self.buffer[0], self.buffer[position:position + length]
+        self.buffer = self.buffer[position + length:]
+        return header, body
+
+    def _send(self, packet_type, body=b""):
+        length, encoded = len(body), bytearray()
+        while True:
+            byte, length = length % 128, length // 128
+            encoded.append(byte | (0x80 if length else 0))
+            if not length:
+                break
+        frame = bytes([packet_type]) + bytes(encoded) + body
+        self.stats["bytes_out"] += len(frame)
+        self.transport.write(frame)
+
+    def _handle(self, header, body):
+        packet_type = header >> 4
+        if packet_type == 1:  # CONNECT
+            self._send(0x20, b"\x00\x00")
+        elif packet_type == 3:  # PUBLISH
+            self.stats["publishes"] += 1
+            qos = (header >> 1) & 0x03
+            topic_length = struct.unpack_from("!H", body)[0]
+            topic = body[2:2 + topic_length].decode()
+            if qos:
+                packet_id = body[2 + topic_length:4 + topic_length]
+                self._send(0x40 if qos == 1 else 0x50, packet_id)
+            payload = body[2 + topic_length + (2 if qos else 0):]
+            for session in list(self.sessions):
+                if topic in session.subscriptions or "#" in session.subscriptions:
+                    encoded = topic.encode()
+                    session._send(0x30, struct.pack("!H", len(encoded)) + encoded + payload)
+        elif packet_type == 6:  # PUBREL
+            self._send(0x70, body[:2])
+        elif packet_type == 8:  # SUBSCRIBE
+            position, granted = 2, bytearray()
+            while position < len(body):
+                topic_length = struct.unpack_from("!H", body, position)[0]
+                self.subscriptions.add(body[position + 2:position + 2 + topic_length].decode())
+                position += 2 + topic_length + 1
+                granted.append(0)
+            self._send(0x90, body[:2] + bytes(granted))
+        elif packet_type == 10:  # UNSUBSCRIBE
+            self._send(0xB0, body[:2])
+        elif packet_type == 12:  # PINGREQ
+            self._send(0xD0)
+        elif packet_type == 14:  # DISCONNECT
+            self.transport.close()
+
+
+class ServerThread(threading.Thread):
+    """Run the simulator and the broker on their own event loop."""
+
+    def __init__(self, simulator_module, port, latency):
+        super().__init__(name="servers", daemon=True)
+        self.simulator = simulator_module.Simulator.create(1, serial_start=int(SERIAL), pin=PIN, port=port, latency=latency, seed=1)
+        self.broker_port = None
+        self.ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.simulator.start())
+        server = self.loop.run_until_complete(self.loop.create_server(MiniBroker, "127.0.0.1", 0))
+        self.broker_port = server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.loop.run_forever()
+
+    def counters(self):
+        stats = self.simulator.protocol.stats
+        return {
+            "requests": stats["received"],
+            "udp_bytes": stats["bytes_in"] + stats["bytes_out"],
+            "mqtt_bytes": MiniBroker.stats["bytes_in"] + MiniBroker.stats["bytes_out"],
+        }
+
+
+#-------------------------------------------------------------------------------
+# Run cycle() repeatedly, first for latency, then once more with tracemalloc
+def measure(servers, cycle, cycles, executor=None):
+    servers.simulator.freeze(SIMULATOR_SEED)
+    for _ in range(WARMUP_CYCLES):
+        cycle()
+    # replies and acknowledgements of the warm-up may still be on their way
+    time.sleep(0.2)
+    base_threads = threading.active_count()
+    before = servers.counters()
+    samples, threads = [], 0
+    for _ in range(cycles):
+        started = time.perf_counter()
+        cycle()
+        samples.append((time.perf_counter() - started) * 1000)
+        threads = max(threads, threading.active_count() - base_threads)
+    # replies and acknowledgements may still be on their way
+    time.sleep(0.2)
+    after = servers.counters()
+
+    allocated = []
+    tracemalloc.start()
+    for _ in range(min(cycles, 20)):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        cycle()
+        allocated.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(samples, n=100)
+    result = {
+        "cycles": cycles,
+        "p50_ms": round(quantiles[49], 3),
+        "p95_ms": round(quantiles[94], 3),
+        "p99_ms": round(quantiles[98], 3),
+        **{key: round((after[key] - before[key]) / cycles, 1) for key in after},
+        "threads": threads,
+        "alloc_peak_kib": round(statistics.mean(allocated) / 1024, 1),
+    }
+    if executor is not None:
+        result["executor_threads"] = executor()
+    return result
+
+
+def calibrate():
+    """Return the median ms of a fixed workload, the speed of this machine."""
+    samples = []
+    for _ in range(CALIBRATION_ROUNDS):
+        started = time.perf_counter()
+        json.loads(json.dumps([str(value) for value in range(5000)]))
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def default_executor_threads(loop):
+    executor = getattr(loop, "_default_executor", None)
+    return 0 if executor is None else len(executor._threads)
+#-------------------------------------------------------------------------------
+
+
+def bench_parse(servers, cycles, simulator):
+    status = load_integration_module("status")
+    payload = simulator.SimulatedStove(SERIAL, PIN, "127.0.0.1").status_payload(len(status.STATUS_KEYS))
+    batch = 100
+
+    def parse_status():
+        for _ in range(batch):
+            status.parse_status(payload)
+
+    def zip_status():
+        for _ in range(batch):
+            dict(zip(status.STATUS_KEYS, payload.split(",")))
+
+    results = {}
+    for name, cycle in (("parse_status", parse_status), ("dict_zip", zip_status)):
+        result = measure(servers, cycle, cycles)
+        # per call instead of per batch
+        for key in ("p50_ms", "p95_ms", "p99_ms", "alloc_peak_kib"):
+            result[key] = round(result[key] / batch, 4)
+        results[f"parse.{name}"] = result
+    return results
+
+
+def bench_poll(servers, cycles, simulator):
+    status = load_integration_module("status")
+    nbe = simulator.nbe
+    loop = asyncio.new_event_loop()
+    transport = nbe.AduroTransport(port=servers.simulator.port)
+    address = "127.0.0.1"
+
+    async def request(function_id, payload):
+        return await transport.async_request(address, SERIAL, PIN, function_id, payload)
+
+    async def refresh(full):
+        fetches = [request(nbe.FUNCTION_GET_STATUS, "*")]
+        if full:
+            fetches += [
+                request(nbe.FUNCTION_GET_CONSUMPTION, "total_days"),
+                request(nbe.FUNCTION_GET_CONSUMPTION, "total_months"),
+                request(nbe.FUNCTION_GET_CONSUMPTION, "total_years"),
+                request(nbe.FUNCTION_GET_SETTINGS, "wifi.router"),
+            ]
+        responses = await asyncio.gather(*fetches)
+        status.parse_status(responses[0].payload)
+
+    results = {}
+    try:
+        for name, full in (("status", False), ("all_groups", True)):
+            results[f"poll.{name}"] = measure(
+                servers,
+                lambda: loop.run_until_complete(refresh(full)),
+                cycles,
+                lambda: default_executor_threads(loop),
+            )
+    finally:
+        loop.run_until_complete(transport.async_close())
+        loop.close()
+    return results
+
+
+def bench_bridge(servers, cycles, simulator):
+    bridge_module = load_script("pyduro_mqtt_bridge")
+    results = {}
+    for mode in ("full", "fields", "delta"):
+        options = bridge_module.parse_args(["--serial", SERIAL, "--pin", PIN, "--stove-ip", "127.0.0.1", "--publish-mode", mode])
+        loop = asyncio.new_event_loop()
+        bridge = bridge_module.StoveBridge(options)
+        bridge.transport = bridge_module.nbe.AduroTransport(port=servers.simulator.port)
+        bridge.loop = loop
+        bridge.client.connect("127.0.0.1", servers.broker_port)
+        bridge.client.loop_start()
+
+        async def cycle():
+            result, data = await bridge_module.get_status(bridge.transport, bridge.ip, SERIAL, PIN)
+            bridge.publish_data("status", data)
+
+        try:
+            results[f"bridge.{mode}"] = measure(
+                servers,
+                lambda: loop.run_until_complete(cycle()),
+                cycles,
+                lambda: default_executor_threads(loop),
+            )
+        finally:
+            bridge.client.loop_stop()
+            bridge.client.disconnect()
+            loop.run_until_complete(bridge.transport.async_close())
+            loop.close()
+    return results
+
+
+def bench_script(servers, cycles, simulator):
+    code = compile((SCRIPTS_PATH / "pyduro_mqtt.py").read_text(), "pyduro_mqtt.py", "exec")
+    state = types.SimpleNamespace(state="127.0.0.1")
+    hass = types.SimpleNamespace(states=types.SimpleNamespace(get=lambda entity_id: state))
+    data = {
+        "MQTT_SERVER_IP": "127.0.0.1",
+        "MQTT_SERVER_PORT": servers.broker_port,
+        "MQTT_BASE_PATH": BASE_PATH,
+        "MQTT_USERNAME": None,
+        "MQTT_PASSWORD": None,
+        "STOVE_SERIAL": SERIAL,
+        "STOVE_PIN": PIN,
+        "MODE": "all",
+    }
+
+    def cycle():
+        # python_script globals, as Home Assistant provides them
+        exec(code, {"__name__": "pyduro_mqtt", "data": data, "hass": hass})
+
+    return {"script.mode_all": measure(servers, cycle, cycles)}
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "poll": bench_poll,
+    "bridge": bench_bridge,
+    "script": bench_script,
+}
+
+
+#-------------------------------------------------------------------------------
+def compare(results, baseline, threshold, latency_threshold, calibration):
+    # latency of the baseline as it would be on this machine
+    machine = baseline.get(MACHINE_KEY, {})
+    scale = calibration / machine["calibration_ms"] if machine.get("calibration_ms") else 1.0
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for key in COMPARED:
+            if key not in result or key not in old:
+                continue
+            if key.endswith("_ms"):
+                expected = old[key] * scale
+                limit, noise = expected * (1 + latency_threshold), LATENCY_NOISE_MS
+            else:
+                expected = old[key]
+                limit, noise = expected * (1 + threshold), 0.01
+            if result[key] > limit and result[key] - expected > noise:
+                regressions.append(f"{name} {key}: {round(expected, 3)} -> {result[key]}")
+    return regressions
+
+
+def print_results(results, baseline):
+    columns = ("p50_ms", "p95_ms", "p99_ms", "requests", "udp_bytes", "mqtt_bytes", "threads", "executor_threads", "alloc_peak_kib")
+    print(f"{'benchmark':<20}" + "".join(f"{column:>17}" for column in columns))
+    for name, result in results.items():
+        old = baseline.get(name, {})
+        cells = []
+        for column in columns:
+            value = result.get(column, "")
+            if column in old and old[column]:
+                value = f"{value} ({(result[column] - old[column]) / old[column]:+.0%})"
+            cells.append(f"{value:>17}")
+        print(f"{name:<20}" + "".join(cells))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the Aduro poll path, parser and MQTT publish cycle")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark", help=f"one of {', '.join(BENCHMARKS)}, all by default")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--script-cycles", type=int, default=20, help="cycles of the slower pyduro_mqtt.py run")
+    parser.add_argument("--port", type=int, default=8483, help="UDP port of the simulator")
+    parser.add_argument("--latency", type=float, default=0, help="ms the simulator waits before replying")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="store the results as baseline")
+    parser.add_argument("--compare", action="store_true", help="exit with 1 if a figure got worse than the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed increase of the counters before --compare fails")
+    parser.add_argument("--latency-threshold", type=float, default=0.5, help="allowed increase of the calibrated latency")
+    parser.add_argument("--debug", action="store_true")
+    options = parser.parse_args(argv)
+    if unknown := set(options.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if options.debug else logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    simulator = load_script("aduro_simulator")
+    servers = ServerThread(simulator, options.port, options.latency)
+    servers.start()
+    servers.ready.wait()
+
+    calibration = calibrate()
+    results = {}
+    for name in options.benchmarks or BENCHMARKS:
+        cycles = options.script_cycles if name == "script" else options.cycles
+        results.update(BENCHMARKS[name](servers, cycles, simulator))
+
+    baseline = json.loads(options.baseline.read_text()) if options.baseline.exists() else {}
+    print_results(results, baseline)
+
+    if options.save:
+        machine = {MACHINE_KEY: {"calibration_ms": calibration}}
+        options.baseline.write_text(json.dumps({**baseline, **results, **machine}, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline to {options.baseline}")
+    if options.compare:
+        regressions = compare(results, baseline, options.threshold, options.latency_threshold, calibration)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+# Offline UDP simulator for Aduro stoves.
+#
+# Answers the NBE frames sent by the integration, pyduro_mqtt.py and the
+# MQTT bridge on one UDP socket, so polling, failover and many stoves can be
+# tested without a stove or the cloud relay:
+#
+#   function 0   discovery broadcast, every simulated stove answers
+#   function 1   settings reads, e.g. wifi.router or boiler.temp
+#   function 2   writes; misc.start / misc.stop drive the state machine
+#   function 4   single operating values, state / substate
+#   function 6   consumption reads, total_days / total_months / total_years
+#   function 11  status ("*") and operating data ("001*")
+#
+# Requests are routed to a stove by the serial in the frame, so hundreds of
+# stoves can share one address. Started stoves go through ignition 1 and 2
+# into operation; temperatures follow the heat level.
+#
+# usage:
+#   python3 aduro_simulator.py --stoves 200 --serial-start 100000 \
+#       --latency 40 --jitter 20 --loss 0.02 --truncate 0.01 --speed 30
+#
+# --replay FILE answers from recorded payloads instead of the model, a JSON
+# object keyed by "<function>:<request payload>", e.g.
+#
+#   {"11:*": ["20.5,20,...", "20.7,20,..."], "6:total_days": ["total_days=..."]}
+#
+# the payloads of a key are returned in turn and repeat after the last one;
+# requests without a recorded key are answered by the model.
+# ------------------------------------------------------------------------------
+
+#---import
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import logging
+import random
+import socket
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from pyduro.actions import STATUS_PARAMS
+
+_LOGGER = logging.getLogger("aduro_simulator")
+
+STATUS_KEYS = tuple(STATUS_PARAMS)
+TRANSPORT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "aduro" / "transport.py"
+
+# Socket buffer asked for, so bursts from hundreds of stoves are not dropped
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Operating data ("001*") is read up to position 121
+OPERATING_DATA_SIZE = 125
+
+# Seconds spent in each state before moving on, divided by --speed
+STATE_TRANSITIONS = {
+    "2": ("4", 870),  # ignition 1
+    "4": ("5", 870),  # ignition 2
+}
+HEAT_LEVEL_POWER = {10: 2.5, 50: 5.0, 100: 8.0}
+
+#-------------------------------------------------------------------------------
+# The NBE transport of the integration has no Home Assistant dependencies,
+# load it straight from its file so the frame format is defined once
+def load_transport_module():
+    spec = importlib.util.spec_from_file_location("aduro_transport", TRANSPORT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+nbe = load_transport_module()
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Request frame: app id (12), serial (6), encryption (1), STX, function (2),
+# sequence (2), pin (10), time (10), padding (4), payload size (3), payload
+def parse_request_frame(data):
+    frame = data.decode(nbe.NBE_ENCODING)
+    if len(frame) < 51 or frame[19] != nbe.NBE_FRAME_START:
+        raise ValueError(f"Malformed request frame: {frame!r}")
+    size = int(frame[48:51])
+    return {
+        "app_id": frame[0:12],
+        "serial": frame[12:18],
+        "function": int(frame[20:22]),
+        "sequence": int(frame[22:24]),
+        "pin": frame[24:34].rstrip("0"),
+        "payload": frame[51:51 + size],
+    }
+
+
+def build_response_frame(app_id, serial, function_id, sequence, status, payload, truncate=False):
+    size = len(payload)
+    if truncate:
+        payload = payload[:size // 2]
+    frame = (
+        f"{app_id:_<12.12}"
+        f"{serial}"
+        f"{nbe.NBE_FRAME_START}"
+        f"{function_id:02d}"
+        f"{sequence:02d}"
+        f"{status:1d}"
+        f"{size:03d}"
+        f"{payload}"
+        f"{nbe.NBE_FRAME_END}"
+    )
+    return frame.encode(nbe.NBE_ENCODING)
+#-------------------------------------------------------------------------------
+
+
+class SimulatedStove:
+    """State, settings and consumption of one simulated stove."""
+
+    def __init__(self, serial, pin, ip, speed=1.0, replay=None, rng=None):
+        self.serial = nbe.normalize_serial(serial)
+        self.pin = pin.rstrip("0")
+        self.ip = ip
+        self.speed = speed
+        self.rng = rng or random.Random()
+        self.clock = time.monotonic
+        self.wallclock = datetime.now
+        self.replay = {key: itertools.cycle(payloads) for key, payloads in (replay or {}).items() if payloads}
+        self.settings = {
+            "boiler.temp": "21",
+            "regulation.fixed_power": "50",
+            "regulation.operation_mode": "0",
+        }
+        self.state = "14"
+        self.substate = "0"
+        self.entered = self.clock()
+        self.smoke_temp = 20.0 + self.rng.uniform(-1, 1)
+        self.shaft_temp = 20.0 + self.rng.uniform(-1, 1)
+        self.boiler_temp = 20.0 + self.rng.uniform(-1, 1)
+        self.updated = self.clock()
+        self.days = [round(self.rng.uniform(0, 12), 1) for _ in range(31)]
+        self.months = [round(self.rng.uniform(50, 300), 1) for _ in range(12)]
+        self.years = [round(self.rng.uniform(800, 2000), 1) for _ in range(5)]
+
+    # -- state machine ---------------------------------------------------------
+
+    def start(self):
+        if self.state in STATE_TRANSITIONS or self.state == "5":
+            return
+        self._enter("2", "0")
+
+    def stop(self):
+        self._enter("14", "0")
+
+    def _enter(self, state, substate):
+        _LOGGER.debug("Stove %s: state %s -> %s", self.serial, self.state, state)
+        self.state = state
+        self.substate = substate
+        self.entered = self.clock()
+
+    def freeze(self, seed):
+        """Stop the clock and reseed, so the same requests get the same replies."""
+        self.advance()
+        now, wallclock = self.clock(), self.wallclock()
+        self.clock = lambda: now
+        self.wallclock = lambda: wallclock
+        self.rng = random.Random(seed)
+
+    def advance(self):
+        now = self.clock()
+        while self.state in STATE_TRANSITIONS:
+            next_state, duration = STATE_TRANSITIONS[self.state]
+            ends = self.entered + duration / self.speed
+            if now < ends:
+                break
+            self._enter(next_state, "0")
+            self.entered = ends
+
+        # Temperatures move towards the target of the current state
+        elapsed = (now - self.updated) * self.speed
+        self.updated = now
+        power = self.power_kw
+        factor = min(1.0, elapsed / 600)
+        self.smoke_temp += (20 + power * 30 - self.smoke_temp) * factor
+        self.shaft_temp += (20 + power * 8 - self.shaft_temp) * factor
+        self.boiler_temp += (18 + power * 0.8 - self.boiler_temp) * factor
+
+    @property
+    def power_kw(self):
+        if self.state == "5":
+            return HEAT_LEVEL_POWER.get(int(self.settings["regulation.fixed_power"]), 5.0)
+        if self.state in STATE_TRANSITIONS:
+            return 1.0
+        return 0.0
+
+    # -- requests ----------------------------------------------------------------
+
+    def handle(self, function_id, payload):
+        """Return the status code and payload answering a request."""
+        replay = self.replay.get(f"{function_id}:{payload}")
+        if replay is not None and function_id != nbe.FUNCTION_SET_SETTINGS:
+            return 0, next(replay)
+        if function_id == nbe.FUNCTION_GET_STATUS:
+            return 0, self.status_payload(OPERATING_DATA_SIZE if payload == "001*" else len(STATUS_KEYS))
+        if function_id == nbe.FUNCTION_GET_OPERATING:
+            return self.operating_payload(payload)
+        if function_id == nbe.FUNCTION_GET_CONSUMPTION:
+            return self.consumption_payload(payload)
+        if function_id == nbe.FUNCTION_GET_SETTINGS:
+            return self.settings_payload(payload)
+        if function_id == nbe.FUNCTION_SET_SETTINGS:
+            return self.write(payload)
+        return 1, ""
+
+    def status_payload(self, size):
+        self.advance()
+        values = ["0"] * size
+        power_kw = self.power_kw
+        fields = {
+            "boiler_temp": f"{self.boiler_temp:.1f}",
+            "boiler_ref": self.settings["boiler.temp"],
+            "state": self.state,
+            "substate_sec": str(int((self.clock() - self.entered) * self.speed)),
+            "substate": self.substate,
+            "oxygen": f"{21 - power_kw * 1.5 + self.rng.uniform(-0.3, 0.3):.1f}",
+            "power_kw": f"{power_kw:.1f}",
+            "shaft_temp": f"{self.shaft_temp:.1f}",
+            "power_pct": f"{power_kw / 8 * 100:.0f}",
+            "smoke_temp": f"{self.smoke_temp + self.rng.uniform(-0.5, 0.5):.1f}",
+            "time": self.wallclock().strftime("%d/%m/%y %H:%M:%S"),
+            "regulation.fixed_power": self.settings["regulation.fixed_power"],
+            "operation_mode": self.settings["regulation.operation_mode"],
+        }
+        for key, value in fields.items():
+            values[STATUS_KEYS.index(key)] = value
+        return ",".join(values)
+
+    def operating_payload(self, payload):
+        self.advance()
+        values = {"state": self.state, "substate": self.substate}
+        if payload not in values:
+            return 1, ""
+        return 0, f"{payload}={values[payload]}"
+
+    def consumption_payload(self, payload):
+        series = {"total_days": self.days, "total_months": self.months, "total_years": self.years}.get(payload)
+        if series is None:
+            return 1, ""
+        if payload == "total_days" and self.state == "5":
+            # Today's counter grows while the stove burns
+            today = self.wallclock().day - 1
+            self.days[today] = round(self.days[today] + 0.01 * self.speed, 2)
+        return 0, f"{payload}=" + ",".join(f"{value}" for value in series)
+
+    def settings_payload(self, payload):
+        if payload == "wifi.router":
+            return 0, f"router=Simulated,0,0,0,{self.ip},192.168.1.1,-55,0,0,02:00:00:{self.serial[:2]}:{self.serial[2:4]}:{self.serial[4:]}"
+        if payload in self.settings:
+            return 0, f"{payload.rsplit('.', 1)[-1]}={self.settings[payload]}"
+        return 1, ""
+
+    def write(self, payload):
+        path, sep, value = payload.partition("=")
+        if not sep:
+            return 1, ""
+        if path == "misc.start":
+            self.start()
+        elif path == "misc.stop":
+            self.stop()
+        elif path in self.settings:
+            self.settings[path] = value
+        else:
+            return 1, ""
+        return 0, ""
+
+    def discovery_payload(self):
+        return f"Serial={self.serial};IP={self.ip};Type=H2;Ver=0.0.0;Build=0;Lang=0"
+
+
+class SimulatorProtocol(asyncio.DatagramProtocol):
+    """Route request frames to simulated stoves and send their replies."""
+
+    def __init__(self, stoves, latency=0.0, jitter=0.0, loss=0.0, truncate=0.0, rng=None):
+        self.stoves = {stove.serial: stove for stove in stoves}
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.truncate = truncate
+        self.rng = rng or random.Random()
+        self.transport = None
+        self.stats = dict.fromkeys(("received", "sent", "dropped", "truncated", "rejected", "bytes_in", "bytes_out"), 0)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.stats["received"] += 1
+        self.stats["bytes_in"] += len(data)
+        try:
+            request = parse_request_frame(data)
+        except ValueError as err:
+            _LOGGER.debug("Dropping datagram from %s: %s", addr, err)
+            return
+
+        if request["function"] == nbe.FUNCTION_DISCOVER:
+            for stove in self.stoves.values():
+                self._reply(addr, request, stove.serial, 0, stove.discovery_payload())
+            return
+
+        stove = self.stoves.get(request["serial"])
+        if stove is None:
+            _LOGGER.debug("No simulated stove %s", request["serial"])
+            return
+        if self.rng.random() < self.loss:
+            self.stats["dropped"] += 1
+            return
+        if request["pin"] != stove.pin:
+            self.stats["rejected"] += 1
+            self._reply(addr, request, stove.serial, 1, "")
+            return
+        status, payload = stove.handle(request["function"], request["payload"])
+        if status:
+            self.stats["rejected"] += 1
+        self._reply(addr, request, stove.serial, status, payload)
+
+    def _reply(self, addr, request, serial, status, payload):
+        truncate = bool(payload) and self.rng.random() < self.truncate
+        frame = build_response_frame(request["app_id"], serial, request["function"], request["sequence"], status, payload, truncate)
+        if truncate:
+            self.stats["truncated"] += 1
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)) / 1000
+        if delay:
+            asyncio.get_running_loop().call_later(delay, self._send, frame, addr)
+        else:
+            self._send(frame, addr)
+
+    def _send(self, frame, addr):
+        if self.transport is None:
+            return
+        self.stats["sent"] += 1
+        self.stats["bytes_out"] += len(frame)
+        self.transport.sendto(frame, addr)
+
+
+class Simulator:
+    """Simulated stoves on one UDP socket, for scripts and benchmarks."""
+
+    def __init__(self, stoves, host="0.0.0.0", port=nbe.NBE_PORT, **faults):
+        self.stoves = stoves
+        self.host = host
+        self.port = port
+        self.faults = faults
+        self.protocol = None
+        self._transport = None
+
+    @classmethod
+    def create(cls, count, serial_start=100000, pin="1234567890", ip="127.0.0.1", speed=1.0, replay=None, seed=None, **kwargs):
+        rng = random.Random(seed)
+        stoves = [
+            SimulatedStove(str(serial_start + index), pin, ip, speed, replay, random.Random(rng.random()))
+            for index in range(count)
+        ]
+        return cls(stoves, rng=rng, **kwargs)
+
+    def freeze(self, seed):
+        """Make the replies of every stove reproducible, e.g. for benchmarks."""
+        for index, stove in enumerate(self.stoves):
+            stove.freeze(seed + index)
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._transport, self.protocol = await loop.create_datagram_endpoint(
+            lambda: SimulatorProtocol(self.stoves, **self.faults),
+            local_addr=(self.host, self.port),
+            allow_broadcast=True,
+        )
+        sock = self._transport.get_extra_info("socket")
+        for option in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+            sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER_SIZE)
+        self.port = self._transport.get_extra_info("sockname")[1]
+        _LOGGER.info("Simulating %d stoves on %s:%d", len(self.stoves), self.host, self.port)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def cycle(self, interval):
+        """Start and stop the stoves in turn, spread over the interval."""
+        while True:
+            for stove in self.stoves:
+                await asyncio.sleep(interval / len(self.stoves))
+                if stove.state in ("2", "4", "5"):
+                    stove.stop()
+                else:
+                    stove.start()
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            _LOGGER.info("Stats: %s", ", ".join(f"{key}={value}" for key, value in self.protocol.stats.items()))
+
+
+#-------------------------------------------------------------------------------
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline UDP simulator for Aduro stoves")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=nbe.NBE_PORT)
+    parser.add_argument("--stoves", type=int, default=1, help="number of simulated stoves")
+    parser.add_argument("--serial-start", type=int, default=100000, help="serial of the first stove, the others count up")
+    parser.add_argument("--pin", default="1234567890")
+    parser.add_argument("--advertise-ip", default="127.0.0.1", help="address the stoves report in discovery replies")
+    parser.add_argument("--latency", type=float, default=0, help="ms before a reply is sent")
+    parser.add_argument("--jitter", type=float, default=0, help="ms added to or taken from the latency at random")
+    parser.add_argument("--loss", type=float, default=0, help="share of requests left unanswered")
+    parser.add_argument("--truncate", type=float, default=0, help="share of replies cut short")
+    parser.add_argument("--speed", type=float, default=1, help="time factor of state transitions and temperatures")
+    parser.add_argument("--cycle", type=float, default=0, help="seconds in which every stove is started or stopped once, 0 disables")
+    parser.add_argument("--replay", type=Path, help="JSON file with recorded payloads")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--stats-interval", type=float, default=60, help="seconds, 0 disables")
+    parser.add_argument("--debug", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def run(options):
+    replay = json.loads(options.replay.read_text()) if options.replay else None
+    simulator = Simulator.create(
+        options.stoves,
+        serial_start=options.serial_start,
+        pin=options.pin,
+        ip=options.advertise_ip,
+        speed=options.speed,
+        replay=replay,
+        seed=options.seed,
+        host=options.host,
+        port=options.port,
+        latency=options.latency,
+        jitter=options.jitter,
+        loss=options.loss,
+        truncate=options.truncate,
+    )
+    await simulator.start()
+    tasks = []
+    if options.cycle:
+        tasks.append(simulator.cycle(options.cycle))
+    if options.stats_interval:
+        tasks.append(simulator.report(options.stats_interval))
+    try:
+        await asyncio.gather(*tasks, asyncio.Event().wait())
+    finally:
+        simulator.close()
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if options.debug else logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(run(options))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import paho.mqtt.client as mqtt
 import asyncio
 
 import json
+import random
 import time
 from datetime import date, timedelta
 
@@ -26,6 +27,22 @@ MODE             = data.get('MODE')
 STOVE_HEATLEVEL  = data.get('STOVE_HEATLEVEL')
 STOVE_START_STOP = data.get('STOVE_START_STOP')
 
+# Field order of the status reply. pyduro's STATUS_PARAMS dict is shared by
+# everyone importing it, so it is only read here and never written to.
+STATUS_KEYS = tuple(STATUS_PARAMS)
+
+# Retries of a request that got no answer: the delay doubles after every
+# attempt and a random part of it is dropped, so stoves polled at the same
+# time do not retry in lockstep. The stove is only discovered again once
+# REDISCOVER_AFTER attempts in a row failed. The integration waits for 3
+# failures, counted across polls; this script starts afresh on every run
+# and only makes RETRY_ATTEMPTS attempts, so it has to rediscover after 2
+# to still use the new address in the same run.
+RETRY_ATTEMPTS   = 3
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY  = 2.0
+REDISCOVER_AFTER = 2
+
 #-------------------------------------------------------------------------------
 #MQTT stuff
 # The callback for when the client receives a CONNACK response from the server.
@@ -46,6 +63,49 @@ async def on_disconnect(client, userdata,rc=0):
 def on_message(client, userdata, msg):
     print(msg.topic+" "+str(msg.payload))
     # more callbacks, etc
+
+# Publish with QoS 1 and keep the message info instead of sleeping after
+# every publish. flush_publishes() waits for the broker acknowledgements
+# once, right before disconnecting.
+pending_publishes = []
+
+def publish(topic, payload):
+    pending_publishes.append(client.publish(topic, payload, qos=1))
+
+def flush_publishes(timeout=5):
+    for info in pending_publishes:
+        if info.rc == mqtt.MQTT_ERR_SUCCESS:
+            info.wait_for_publish(timeout)
+    pending_publishes.clear()
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Retry a request with exponential backoff and jitter
+def retry_delay(attempt):
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def run_with_retry(request):
+    # request(ip) returns a tuple starting with 0 when it succeeded, anything
+    # else is a failure
+    global ip
+    failures = 0
+    for attempt in range(RETRY_ATTEMPTS):
+        if attempt:
+            time.sleep(retry_delay(attempt))
+        try:
+            outcome = request(ip)
+        except:
+            outcome = -1
+        if isinstance(outcome, tuple) and outcome and outcome[0] == 0:
+            return outcome
+        failures += 1
+        if failures >= REDISCOVER_AFTER and attempt + 1 < RETRY_ATTEMPTS:
+            discovered, discovered_ip, serial, mqtt_json_discover_data = get_discovery_data()
+            if discovered == 0:
+                ip = discovered_ip
+            failures = 0
+    return -1
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
@@ -193,6 +253,13 @@ def get_consumption_data(ip, serial, pin):
         return result, mqtt_json_data
 #-------------------------------------------------------------------------------
 
+#-------------------------------------------------------------------------------
+# Decode a status reply into a new dict, a short reply only holds the
+# fields it contains
+def decode_status(payload):
+    return dict(zip(STATUS_KEYS, payload.split(",")))
+#-------------------------------------------------------------------------------
+
 #-------------------------------------------------------------------------------
 # Get Stove Status Data
 def get_status(ip, serial, pin):
@@ -211,19 +278,14 @@ def get_status(ip, serial, pin):
             payload="*"
             )
 
-        status = response.parse_payload().split(",")
         response = response.parse_payload()
+        status = decode_status(response)
     except:
         result = -1
         return result, mqtt_json_data
 
-    i = 0
-    for key in STATUS_PARAMS:
-        STATUS_PARAMS[key] = status[i]
-        i += 1
-
     if response:
-        status_json = {"STATUS": STATUS_PARAMS}
+        status_json = {"STATUS": status}
         mqtt_json_data = json.dumps(status_json)
         #print(mqtt_json_data)
         result = 0
@@ -352,7 +414,7 @@ def set_heatlevel(ip, STOVE_SERIAL, STOVE_PIN, heatlevel):
         result = 0
     else:
         result = -1
-        return result
+    return result, data
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
@@ -373,7 +435,7 @@ def set_force_auger(ip, STOVE_SERIAL, STOVE_PIN):
         result = 0
     else:
         result = -1
-        return result
+    return result, data
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
@@ -399,7 +461,7 @@ def set_start_stop(ip, STOVE_SERIAL, STOVE_PIN, start_stop):
         result = 0
     else:
         result = -1
-        return result
+    return result, data
 #--------------------------------------------------------------------------------
 
 #--------------------------------[MAIN]-----------------------------------------
@@ -436,11 +498,11 @@ if "0.0.0.0" in ip or ip == "unknown" or ip == "no connection" or ip == aduro_cl
         mqtt_json_discover_data = json.dumps(discovery_json)
 
         if MQTT_SERVER_IP != None:
-            client.publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
-            time.sleep(0.2)
+            publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
     except:
         #logger.info(f"Discovery Exeption!")
         if MQTT_SERVER_IP != None:
+            flush_publishes()
             client.disconnect()
         exit()
 #-------------------------------------------------------------------------------
@@ -448,115 +510,47 @@ if "0.0.0.0" in ip or ip == "unknown" or ip == "no connection" or ip == aduro_cl
 #-------------------------------------------------------------------------------
 # Get Stove Discovery data    
 if MODE == "discover" or MODE == "all":
-    try:
-        result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-        client.publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
-        time.sleep(0.2)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            #print("Discovery retry: %2d" %x)
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            if result != -1:
-                client.publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
-                time.sleep(0.2)
-                break
+    outcome = run_with_retry(lambda ip: get_discovery_data())
+    if outcome == -1:
+        flush_publishes()
         client.disconnect()
         exit()
+    result, ip, serial, mqtt_json_discover_data = outcome
+    publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
 # Get Stove network data
 if MODE == "network" or MODE == "all":
-    try:
-        result, mqtt_json_network_data = get_network_data(ip, STOVE_SERIAL, STOVE_PIN)
-        client.publish(MQTT_BASE_PATH + "network", str(mqtt_json_network_data))
-        time.sleep(0.2)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            result, mqtt_json_network_data = get_network_data(ip, STOVE_SERIAL, STOVE_PIN)
-            if result != -1:
-                client.publish(MQTT_BASE_PATH + "network", str(mqtt_json_network_data))
-                time.sleep(0.2)
-                break
+    outcome = run_with_retry(lambda ip: get_network_data(ip, STOVE_SERIAL, STOVE_PIN))
+    if outcome != -1:
+        publish(MQTT_BASE_PATH + "network", str(outcome[1]))
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
 # Get consumption data today and yesterday
 if MODE == "consumption" or MODE == "all":
-    try:
-        result, mqtt_json_consumption_data = get_consumption_data(ip,STOVE_SERIAL,STOVE_PIN)                
-        client.publish(MQTT_BASE_PATH + "consumption_data", str(mqtt_json_consumption_data))
-        time.sleep(0.2)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            result, mqtt_json_consumption_data = get_consumption_data(ip,STOVE_SERIAL,STOVE_PIN)                
-            if result != -1:
-                client.publish(MQTT_BASE_PATH + "consumption_data", str(mqtt_json_consumption_data))
-                time.sleep(0.2)
-                break
+    outcome = run_with_retry(lambda ip: get_consumption_data(ip, STOVE_SERIAL, STOVE_PIN))
+    if outcome != -1:
+        publish(MQTT_BASE_PATH + "consumption_data", str(outcome[1]))
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
 # Get Status
 if MODE == "status" or MODE == "all":
-    try:
-        result, mqtt_json_status_data = get_status(ip, STOVE_SERIAL, STOVE_PIN)
-        client.publish(MQTT_BASE_PATH + "status", str(mqtt_json_status_data))
-        time.sleep(0.2)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            result, mqtt_json_status_data = get_status(ip, STOVE_SERIAL, STOVE_PIN)
-            if result != -1:
-                client.publish(MQTT_BASE_PATH + "status", str(mqtt_json_status_data))
-                time.sleep(0.2)
-                break
+    outcome = run_with_retry(lambda ip: get_status(ip, STOVE_SERIAL, STOVE_PIN))
+    if outcome != -1:
+        publish(MQTT_BASE_PATH + "status", str(outcome[1]))
 #-------------------------------------------------------------------------------
 if MODE == "set_heatlevel":
-    try:
-        result = set_heatlevel(ip, serial, STOVE_PIN, STOVE_HEATLEVEL)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            result = set_heatlevel(ip, serial, STOVE_PIN, STOVE_HEATLEVEL)
-            if result != -1:
-                break
+    result = run_with_retry(lambda ip: set_heatlevel(ip, STOVE_SERIAL, STOVE_PIN, STOVE_HEATLEVEL))
 #---------------------------------------------------------------------------------
 if MODE == "set_force_auger":
-    try:
-        result = set_force_auger(ip, STOVE_SERIAL, STOVE_PIN)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            result = set_force_auger(ip, STOVE_SERIAL, STOVE_PIN)
-            if result != -1:
-                break
+    result = run_with_retry(lambda ip: set_force_auger(ip, STOVE_SERIAL, STOVE_PIN))
 #---------------------------------------------------------------------------------
 if MODE == "set_start_stop":
-    try:
-        result = set_start_stop(ip, serial, STOVE_PIN, STOVE_START_STOP)
-    except:
-        #retries 3 times
-        for x in range(0, 3):
-            time.sleep(1)
-            result, ip, serial, mqtt_json_discover_data = get_discovery_data()
-            result = set_start_stop(ip, serial, STOVE_PIN, STOVE_START_STOP)
-            if result != -1:
-                break
+    result = run_with_retry(lambda ip: set_start_stop(ip, STOVE_SERIAL, STOVE_PIN, STOVE_START_STOP))
 #---------------------------------------------------------------------------------
 if MQTT_SERVER_IP != None:
+    flush_publishes()
     client.disconnect()
\ No newline at end of file
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+# Long running MQTT bridge for Aduro stoves.
+#
+# Replaces the "aduro_mqtt_call" automation that starts pyduro_mqtt.py every
+# 20 s. The bridge keeps one MQTT connection and one UDP socket to the stove
+# open, publishes discovery, network, consumption and status data on its own
+# schedule to the same topics as pyduro_mqtt.py and listens for commands on
+#
+#   <MQTT_BASE_PATH>set_heatlevel    payload: 1, 2 or 3
+#   <MQTT_BASE_PATH>set_start_stop   payload: start or stop
+#   <MQTT_BASE_PATH>set_custom       payload: {"path": "boiler.temp", "value": 21}
+#
+# usage:
+#   python3 pyduro_mqtt_bridge.py --serial 123456 --pin 1234567890 \
+#       --mqtt-host 192.168.1.10 --mqtt-username user --mqtt-password pass
+#
+# --publish-mode selects how the data is published:
+#   full    the whole JSON document on every cycle (as pyduro_mqtt.py does)
+#   fields  each field that changed on its own retained topic,
+#           e.g. <MQTT_BASE_PATH>status/smoke_temp
+#   delta   a JSON document with only the changed fields on
+#           <MQTT_BASE_PATH><topic>/delta
+#
+# every option can also be given as environment variable, e.g. STOVE_SERIAL,
+# STOVE_PIN, MQTT_SERVER_IP, MQTT_SERVER_PORT, MQTT_USERNAME, MQTT_PASSWORD
+# and MQTT_BASE_PATH, matching the names used by pyduro_scripts.yaml
+# ------------------------------------------------------------------------------
+
+#---import
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import paho.mqtt.client as mqtt
+from pyduro.actions import STATUS_PARAMS
+
+_LOGGER = logging.getLogger("pyduro_mqtt_bridge")
+
+ADURO_CLOUD_BACKUP_ADDRESS = "apprelay20.stokercloud.dk"
+STATUS_KEYS = tuple(STATUS_PARAMS)
+TRANSPORT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "aduro" / "transport.py"
+
+#-------------------------------------------------------------------------------
+# The NBE transport of the integration has no Home Assistant dependencies,
+# load it straight from its file so the bridge shares one socket per stove
+def load_transport_module():
+    spec = importlib.util.spec_from_file_location("aduro_transport", TRANSPORT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+nbe = load_transport_module()
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Get Stove Discovery data
+async def get_discovery_data(transport, aduro_cloud_backup_address = ADURO_CLOUD_BACKUP_ADDRESS):
+    try:
+        data = await transport.async_discover()
+    except nbe.AduroTransportError:
+        discovery_json = {"DISCOVERY": {"StoveSerial": " ", "StoveIP": "no connection", "NBE_Type": " ", "StoveSWVersion": " ", "StoveSWBuild": " ", "StoveLanguage": " "}}
+        return -1, aduro_cloud_backup_address, " ", discovery_json
+
+    serial = data.get('Serial', " ")
+    ip = data.get('IP', aduro_cloud_backup_address)
+
+    # check if IP is valid. fallback to Stove Cloud address if not valid
+    if "0.0.0.0" in ip:
+        ip = aduro_cloud_backup_address
+
+    discovery_json = {"DISCOVERY": {"StoveSerial": serial, "StoveIP": ip, "NBE_Type": data.get('Type', " "), "StoveSWVersion": data.get('Ver', " "), "StoveSWBuild": data.get('Build', " "), "StoveLanguage": data.get('Lang', " ")}}
+    return 0, ip, serial, discovery_json
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# A short or malformed reply fails this cycle only, like a lost request
+def parse_failed(name, err):
+    _LOGGER.warning("Could not parse %s reply from stove: %s", name, err)
+    return -1, None
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Get Stove Consumption data
+async def get_consumption_data(transport, ip, serial, pin):
+    try:
+        days, months, years = await asyncio.gather(
+            transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_GET_CONSUMPTION, "total_days"),
+            transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_GET_CONSUMPTION, "total_months"),
+            transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_GET_CONSUMPTION, "total_years"),
+        )
+    except nbe.AduroTransportError:
+        return -1, None
+
+    try:
+        data = days.payload.split(',')
+        data[0] = data[0][11:] #remove total_days from string
+        today = date.today().day #get current day from calender
+        yesterday = (date.today() - timedelta(1)).day
+        consumption_today = data[today-1]
+        consumption_yesterday = data[yesterday-1]
+
+        data = months.payload.split(',')
+        data[0] = data[0][13:] #remove total_months from string
+        consumption_month = data[date.today().month-1]
+
+        data = years.payload.split(',')
+        data[0] = data[0][12:] #remove total_years from string
+        consumption_year = data[len(data)-1] #last entry is the current year
+    except (IndexError, ValueError) as err:
+        return parse_failed("consumption", err)
+
+    consumption_json = {"CONSUMPTION": {"Day": consumption_today, "Yesterday": consumption_yesterday, "Month": consumption_month, "Year": consumption_year}}
+    return 0, consumption_json
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Get Stove Status Data
+async def get_status(transport, ip, serial, pin):
+    try:
+        response = await transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_GET_STATUS, "*")
+    except nbe.AduroTransportError:
+        return -1, None
+
+    status = dict(zip(STATUS_KEYS, response.payload.split(",")))
+    return 0, {"STATUS": status}
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Get Stove Network Data
+async def get_network_data(transport, ip, serial, pin):
+    try:
+        response = await transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_GET_SETTINGS, "wifi.router")
+    except nbe.AduroTransportError:
+        return -1, None
+
+    data = response.payload.split(',')
+    try:
+        network_json = {"NETWORK": {"RouterSSID": data[0][7:], "StoveIP": data[4], "RouterIP": data[5], "StoveRSSI": data[6], "StoveMAC": data[9]}}
+    except IndexError as err:
+        return parse_failed("network", err)
+    return 0, network_json
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Get Stove Operating Data
+async def get_operating_data(transport, ip, serial, pin):
+    try:
+        response = await transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_GET_STATUS, "001*")
+    except nbe.AduroTransportError:
+        return -1, None
+
+    data = response.payload.split(',')
+    try:
+        operating_data_json = {"OPERATING": {
+            "Power_kw": data[31],
+            "Power_pct": data[36],
+            "SmokeTemp": data[37],
+            "ShaftTemp": data[35],
+            "TimeStove": data[94][9:],
+            "DateStove": data[94][0:5]+"/"+str(20)+data[94][6:8],
+            "State": data[6],
+            "OperatingTimeAuger": data[119],
+            "OperatingTimeStove": data[121],
+            "OperatingTimeIgnition": data[120]}}
+    except IndexError as err:
+        return parse_failed("operating", err)
+    return 0, operating_data_json
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# Set a value on the stove
+async def set_value(transport, ip, serial, pin, path, value):
+    try:
+        await transport.async_request_retry(ip, serial, pin, nbe.FUNCTION_SET_SETTINGS, f"{path}={value}")
+    except nbe.AduroTransportError:
+        return -1
+    return 0
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+# MQTT client compatible with paho-mqtt 1.x and 2.x
+def create_mqtt_client():
+    if hasattr(mqtt, "CallbackAPIVersion"):
+        return mqtt.Client(mqtt.CallbackAPIVersion.VERSION1)
+    return mqtt.Client()
+#-------------------------------------------------------------------------------
+
+
+class StoveBridge:
+    """Publish stove data to MQTT and forward commands to the stove."""
+
+    def __init__(self, options):
+        self.options = options
+        self.base_path = options.base_path
+        self.transport = nbe.AduroTransport()
+        self.client = create_mqtt_client()
+        self.ip = options.stove_ip
+        self.failures = 0
+        self.commands = asyncio.Queue()
+        self.discovery_lock = asyncio.Lock()
+        self.published = {}
+        self.loop = None
+
+    #---MQTT callbacks, called from the paho network thread
+    def on_connect(self, client, userdata, flags, rc):
+        _LOGGER.info("Connected to MQTT broker with result code %s", rc)
+        # Subscribing in on_connect() renews the subscriptions after a reconnect
+        for command in ("set_heatlevel", "set_start_stop", "set_custom"):
+            client.subscribe(self.base_path + command)
+        # Send everything again after a reconnect, deltas may have been lost
+        self.loop.call_soon_threadsafe(self.published.clear)
+
+    def on_message(self, client, userdata, msg):
+        self.loop.call_soon_threadsafe(self.commands.put_nowait, (msg.topic, msg.payload.decode()))
+
+    def publish(self, topic, payload, retain=False):
+        self.client.publish(self.base_path + topic, payload, retain=retain)
+
+    def publish_data(self, topic, mqtt_data):
+        if self.options.publish_mode == "full":
+            self.publish(topic, json.dumps(mqtt_data))
+            return
+
+        # diff every section (e.g. "STATUS") against the snapshot sent last time
+        last = self.published.setdefault(topic, {})
+        for section, values in mqtt_data.items():
+            changed = {key: value for key, value in values.items() if last.get(key) != value}
+            if not changed:
+                continue
+            last.update(changed)
+            if self.options.publish_mode == "fields":
+                for key, value in changed.items():
+                    self.publish(topic + "/" + key, str(value), retain=True)
+            else:
+                self.publish(topic + "/delta", json.dumps({section: changed}))
+
+    #---stove access
+    async def stove_ip(self):
+        async with self.discovery_lock:
+            if self.ip is None:
+                result, ip, serial, discovery_data = await get_discovery_data(self.transport)
+                self.publish_data("discovery", discovery_data)
+                self.ip = ip
+            return self.ip
+
+    def record_result(self, result):
+        # requests are already retried, only look for the stove again once
+        # several of them failed in a row
+        if result == 0:
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= nbe.DEFAULT_RETRY_POLICY.rediscover_after:
+            _LOGGER.warning("Stove not answering at %s, rediscovering", self.ip)
+            self.failures = 0
+            self.ip = None
+
+    async def poll(self, name, fetch, topic, interval):
+        while True:
+            ip = await self.stove_ip()
+            result, mqtt_data = await fetch(self.transport, ip, self.options.serial, self.options.pin)
+            if result == 0:
+                self.publish_data(topic, mqtt_data)
+            else:
+                _LOGGER.warning("Failed to get %s data from %s", name, ip)
+            self.record_result(result)
+            await asyncio.sleep(interval)
+
+    async def poll_discovery(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            result, ip, serial, discovery_data = await get_discovery_data(self.transport)
+            if result == 0:
+                self.ip = ip
+                self.publish_data("discovery", discovery_data)
+
+    async def handle_commands(self):
+        while True:
+            topic, payload = await self.commands.get()
+            command = topic[len(self.base_path):]
+            try:
+                if command == "set_heatlevel":
+                    path, value = "regulation.fixed_power", {1: 10, 2: 50, 3: 100}[int(payload)]
+                elif command == "set_start_stop":
+                    path, value = {"start": "misc.start", "stop": "misc.stop"}[payload.strip()], 1
+                else:
+                    custom = json.loads(payload)
+                    path, value = custom["path"], custom["value"]
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Ignoring invalid %s command: %s", command, payload)
+                continue
+
+            ip = await self.stove_ip()
+            result = await set_value(self.transport, ip, self.options.serial, self.options.pin, path, value)
+            self.record_result(result)
+            if result != 0:
+                _LOGGER.warning("Failed to set %s to %s", path, value)
+                continue
+
+            # publish the new state right away instead of waiting for the next cycle
+            result, status_data = await get_status(self.transport, ip, self.options.serial, self.options.pin)
+            if result == 0:
+                self.publish_data("status", status_data)
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+
+        self.client.on_connect = self.on_connect
+        self.client.on_message = self.on_message
+        if self.options.mqtt_username:
+            self.client.username_pw_set(username=self.options.mqtt_username, password=self.options.mqtt_password)
+        self.client.connect_async(self.options.mqtt_host, self.options.mqtt_port, 60)
+        self.client.loop_start()
+
+        tasks = [
+            self.poll("status", get_status, "status", self.options.status_interval),
+            self.poll("consumption", get_consumption_data, "consumption_data", self.options.consumption_interval),
+            self.poll("network", get_network_data, "network", self.options.network_interval),
+            self.poll_discovery(self.options.discovery_interval),
+            self.handle_commands(),
+        ]
+        if self.options.operating_interval > 0:
+            tasks.append(self.poll("operating", get_operating_data, "operating", self.options.operating_interval))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.client.loop_stop()
+            self.client.disconnect()
+            await self.transport.async_close()
+
+
+#-------------------------------------------------------------------------------
+def parse_args(argv=None):
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description="Long running MQTT bridge for Aduro stoves")
+    parser.add_argument("--serial", default=env("STOVE_SERIAL"), required=env("STOVE_SERIAL") is None)
+    parser.add_argument("--pin", default=env("STOVE_PIN"), required=env("STOVE_PIN") is None)
+    parser.add_argument("--stove-ip", default=env("STOVE_IP"), help="skip discovery and use this address")
+    parser.add_argument("--mqtt-host", default=env("MQTT_SERVER_IP", "localhost"))
+    parser.add_argument("--mqtt-port", type=int, default=int(env("MQTT_SERVER_PORT", "1883")))
+    parser.add_argument("--mqtt-username", default=env("MQTT_USERNAME"))
+    parser.add_argument("--mqtt-password", default=env("MQTT_PASSWORD"))
+    parser.add_argument("--base-path", default=env("MQTT_BASE_PATH", "aduro_h2/"))
+    parser.add_argument("--status-interval", type=float, default=20, help="seconds")
+    parser.add_argument("--consumption-interval", type=float, default=300, help="seconds")
+    parser.add_argument("--network-interval", type=float, default=3600, help="seconds")
+    parser.add_argument("--discovery-interval", type=float, default=3600, help="seconds")
+    parser.add_argument("--operating-interval", type=float, default=0, help="seconds, 0 disables")
+    parser.add_argument("--publish-mode", choices=("full", "fields", "delta"), default=env("MQTT_PUBLISH_MODE", "full"))
+    parser.add_argument("--debug", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if options.debug else logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(StoveBridge(options).run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
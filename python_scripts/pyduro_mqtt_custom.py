@@ -49,6 +49,20 @@ async def on_disconnect(client, userdata,rc=0):
 def on_message(client, userdata, msg):
     print(msg.topic+" "+str(msg.payload))
     # more callbacks, etc
+
+# Publish with QoS 1 and keep the message info instead of sleeping after
+# every publish. flush_publishes() waits for the broker acknowledgements
+# once, right before disconnecting.
+pending_publishes = []
+
+def publish(topic, payload):
+    pending_publishes.append(client.publish(topic, payload, qos=1))
+
+def flush_publishes(timeout=5):
+    for info in pending_publishes:
+        if info.rc == mqtt.MQTT_ERR_SUCCESS:
+            info.wait_for_publish(timeout)
+    pending_publishes.clear()
 #-------------------------------------------------------------------------------
 
 #-------------------------------------------------------------------------------
@@ -202,11 +216,11 @@ if "0.0.0.0" in ip or ip == "unknown" or ip == "no connection" or ip == aduro_cl
         mqtt_json_discover_data = json.dumps(discovery_json)
 
         if MQTT_SERVER_IP != None:
-            client.publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
-            time.sleep(0.2)
+            publish(MQTT_BASE_PATH + "discovery", str(mqtt_json_discover_data))
     except:
         #logger.info(f"Discovery Exeption!")
         if MQTT_SERVER_IP != None:
+            flush_publishes()
             client.disconnect()
         exit()
 #-------------------------------------------------------------------------------
@@ -258,5 +272,6 @@ if MODE == "set_custom":
 
 #---------------------------------------------------------------------------------
 if MQTT_SERVER_IP != None:
+    flush_publishes()
     client.disconnect()
 
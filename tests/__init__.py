@@ -0,0 +1 @@
+"""Tests for the Aduro Hybrid Stove integration."""
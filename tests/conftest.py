@@ -0,0 +1,8 @@
+"""Fixtures for the Aduro Hybrid Stove tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
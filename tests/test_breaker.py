@@ -0,0 +1,44 @@
+"""Tests for the Aduro circuit breaker."""
+from datetime import timedelta
+
+from custom_components.aduro.breaker import (
+    BREAKER_CLOSED,
+    BREAKER_OPEN,
+    AduroCircuitBreaker,
+)
+
+
+def test_opens_after_threshold() -> None:
+    """The breaker opens once, on the failure that reaches the threshold."""
+    breaker = AduroCircuitBreaker("123456", 3, timedelta(minutes=2))
+    assert [breaker.record_failure() for _ in range(4)] == [False, False, True, False]
+    assert breaker.is_open
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.trips == 1
+
+
+def test_success_resets_failures() -> None:
+    """An answer in between starts the count of failures again."""
+    breaker = AduroCircuitBreaker("123456", 3, timedelta(minutes=2))
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.record_success()
+    assert not breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_closes_on_success() -> None:
+    """The first answer closes an open breaker."""
+    breaker = AduroCircuitBreaker("123456", 1, timedelta(minutes=2))
+    breaker.record_failure()
+    assert breaker.as_dict()["opened"] is not None
+    assert breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.as_dict() == {
+        "state": BREAKER_CLOSED,
+        "failures": 0,
+        "threshold": 1,
+        "probe_interval": 120.0,
+        "opened": None,
+        "trips": 1,
+    }
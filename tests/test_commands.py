@@ -0,0 +1,31 @@
+"""Tests for the Aduro command queue."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.aduro.commands import AduroCommandQueue
+
+
+async def test_enqueue_during_flush(hass: HomeAssistant) -> None:
+    """A write queued while a batch is refreshing is sent as the next batch."""
+    written = []
+    refreshing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def write(path, value):
+        written.append((path, value))
+
+    async def on_flushed():
+        refreshing.set()
+        await release.wait()
+
+    queue = AduroCommandQueue(hass, write, on_flushed, delay=0)
+    first = hass.async_create_task(queue.async_enqueue("boiler.temp", 20))
+    await asyncio.wait_for(refreshing.wait(), 1)
+
+    second = hass.async_create_task(queue.async_enqueue("misc.start", 1))
+    await asyncio.sleep(0)
+    release.set()
+
+    await asyncio.wait_for(asyncio.gather(first, second), 1)
+    assert written == [("boiler.temp", 20), ("misc.start", 1)]
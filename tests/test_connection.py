@@ -0,0 +1,50 @@
+"""Tests for the Aduro connection manager."""
+from unittest.mock import AsyncMock, Mock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.aduro.connection import AduroConnectionManager
+from custom_components.aduro.const import CLOUD_RELAY_ADDRESS
+from custom_components.aduro.transport import (
+    FUNCTION_GET_STATUS,
+    AduroResponse,
+    AduroTimeoutError,
+    RetryPolicy,
+)
+
+
+def connection_manager(hass: HomeAssistant) -> AduroConnectionManager:
+    """Return a manager for a stove found on the LAN."""
+    transport = Mock()
+    transport.async_request = AsyncMock(
+        return_value=AduroResponse("012345", FUNCTION_GET_STATUS, 1, 0, "")
+    )
+    connection = AduroConnectionManager(hass, transport, "12345", "1234", AsyncMock())
+    connection.set_local_address("192.168.1.20")
+    return connection
+
+
+async def test_prefers_lan_after_it_answered(hass: HomeAssistant) -> None:
+    """A LAN that answered is not given up for a cloud relay never tried."""
+    connection = connection_manager(hass)
+    assert connection.endpoint is connection.local
+
+    await connection.async_request(FUNCTION_GET_STATUS, "*")
+    connection.local.record_success(40.0)
+    assert connection.endpoint is connection.local
+    assert connection.local.score > connection.cloud.score
+
+
+async def test_falls_back_to_cloud(hass: HomeAssistant) -> None:
+    """A retry after the LAN timed out goes to the cloud relay."""
+    connection = connection_manager(hass)
+    connection.retry_policy = RetryPolicy(base_delay=0, max_delay=0)
+    connection.transport.async_request.side_effect = [
+        AduroTimeoutError("no answer"),
+        AduroResponse("012345", FUNCTION_GET_STATUS, 2, 0, ""),
+    ]
+
+    await connection.async_request(FUNCTION_GET_STATUS, "*")
+    addresses = [call.args[0] for call in connection.transport.async_request.await_args_list]
+    assert addresses == ["192.168.1.20", CLOUD_RELAY_ADDRESS]
+    assert connection.endpoint is connection.cloud
@@ -0,0 +1,127 @@
+"""Tests for the Aduro coordinator."""
+from datetime import timedelta
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import pytest
+
+from custom_components.aduro.breaker import AduroCircuitBreaker
+from custom_components.aduro.coordinator import AduroDataUpdateCoordinator
+from custom_components.aduro.metrics import AduroMetrics
+from custom_components.aduro.status import STATUS_KEYS
+from custom_components.aduro.transport import (
+    FUNCTION_GET_OPERATING,
+    FUNCTION_GET_STATUS,
+    AduroResponse,
+    AduroResponseError,
+    AduroTimeoutError,
+)
+
+
+def bare_coordinator(replies: list) -> AduroDataUpdateCoordinator:
+    """Return a coordinator whose requests get the given replies."""
+    coordinator = AduroDataUpdateCoordinator.__new__(AduroDataUpdateCoordinator)
+    coordinator.stove_serial = "123456"
+    coordinator._probe_operating = True
+    coordinator._async_request = AsyncMock(
+        side_effect=[
+            reply
+            if isinstance(reply, Exception)
+            else AduroResponse("123456", function_id, 1, 0, reply)
+            for function_id, reply in replies
+        ]
+    )
+    return coordinator
+
+
+def status_payload(state: str, substate: str) -> str:
+    """Return a status reply with the given state and substate."""
+    values = {"state": state, "substate": substate}
+    return ",".join(values.get(key, "0") for key in STATUS_KEYS)
+
+
+@pytest.mark.parametrize(("level", "power"), [(1, 10), (2, 50), (3, 100)])
+async def test_set_heatlevel(level: int, power: int) -> None:
+    """Heat levels are written as the fixed power of the stove."""
+    coordinator = SimpleNamespace(_async_set=AsyncMock())
+    await AduroDataUpdateCoordinator.async_set_heatlevel(coordinator, level)
+    coordinator._async_set.assert_awaited_once_with("regulation.fixed_power", power)
+
+
+@pytest.mark.parametrize("level", [0, 4, 50])
+async def test_set_invalid_heatlevel(level: int) -> None:
+    """Heat levels outside 1-3 are rejected without writing."""
+    coordinator = SimpleNamespace(_async_set=AsyncMock())
+    with pytest.raises(ServiceValidationError):
+        await AduroDataUpdateCoordinator.async_set_heatlevel(coordinator, level)
+    coordinator._async_set.assert_not_awaited()
+
+
+async def test_probe_state() -> None:
+    """The probe asks for the state and substate operating values."""
+    coordinator = bare_coordinator(
+        [(FUNCTION_GET_OPERATING, "state=5"), (FUNCTION_GET_OPERATING, "substate=6")]
+    )
+    assert await coordinator.async_probe_state() == ("5", "6")
+    assert [call.args[:2] for call in coordinator._async_request.await_args_list] == [
+        (FUNCTION_GET_OPERATING, "state"),
+        (FUNCTION_GET_OPERATING, "substate"),
+    ]
+
+
+@pytest.mark.parametrize("reply", ["", "substate=6", AduroResponseError("rejected")])
+async def test_probe_state_falls_back_to_status(reply) -> None:
+    """A stove without the operating values is probed with the status request."""
+    coordinator = bare_coordinator(
+        [
+            (FUNCTION_GET_OPERATING, reply),
+            (FUNCTION_GET_STATUS, status_payload("5", "6")),
+            (FUNCTION_GET_STATUS, status_payload("6", "0")),
+        ]
+    )
+    assert await coordinator.async_probe_state() == ("5", "6")
+    assert await coordinator.async_probe_state() == ("6", "0")
+    assert coordinator._async_request.await_count == 3
+
+
+async def test_probe_state_without_answer() -> None:
+    """A probe the stove does not answer returns None."""
+    coordinator = bare_coordinator([(FUNCTION_GET_OPERATING, AduroTimeoutError("lost"))])
+    assert await coordinator.async_probe_state() is None
+    assert coordinator._probe_operating
+
+
+def open_breaker(coordinator: AduroDataUpdateCoordinator) -> None:
+    """Give the coordinator an open breaker."""
+    coordinator.metrics = AduroMetrics()
+    coordinator.breaker = AduroCircuitBreaker("123456", 1, timedelta(minutes=2))
+    coordinator.breaker.record_failure()
+    coordinator._async_resume_polling = Mock()
+
+
+async def test_breaker_probe() -> None:
+    """An open breaker is closed by an answer to the small state probe."""
+    coordinator = bare_coordinator(
+        [(FUNCTION_GET_OPERATING, "state=14"), (FUNCTION_GET_OPERATING, "substate=0")]
+    )
+    open_breaker(coordinator)
+    await coordinator._async_probe_breaker(time.monotonic())
+    assert not coordinator.breaker.is_open
+    coordinator._async_resume_polling.assert_called_once()
+    assert all(
+        call.args[0] == FUNCTION_GET_OPERATING
+        for call in coordinator._async_request.await_args_list
+    )
+
+
+async def test_breaker_probe_without_answer() -> None:
+    """The breaker stays open while the stove does not answer the probe."""
+    coordinator = bare_coordinator([(FUNCTION_GET_OPERATING, AduroTimeoutError("lost"))])
+    open_breaker(coordinator)
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_probe_breaker(time.monotonic())
+    assert coordinator.breaker.is_open
+    coordinator._async_resume_polling.assert_not_called()
@@ -0,0 +1,72 @@
+"""Tests for the Aduro status history."""
+import math
+
+from custom_components.aduro.history import (
+    CHANNELS,
+    HISTORY_TIERS,
+    RingBuffer,
+    RollupTier,
+    StoveHistory,
+)
+from custom_components.aduro.status import AduroStatus
+
+
+def sample(value: float) -> list[float]:
+    """Return a sample with the same value on every channel."""
+    return [value] * len(CHANNELS)
+
+
+def test_ring_buffer_overwrites_oldest() -> None:
+    """A full buffer drops its oldest samples and keeps the order."""
+    buffer = RingBuffer(3)
+    for timestamp in range(5):
+        buffer.append(float(timestamp), sample(timestamp))
+    positions = buffer.indexes(0, 10)
+    assert [buffer.timestamps[pos] for pos in positions] == [2.0, 3.0, 4.0]
+    assert [buffer.columns[0][pos] for pos in positions] == [2.0, 3.0, 4.0]
+    assert [buffer.timestamps[pos] for pos in buffer.indexes(3, 3)] == [3.0]
+
+
+def test_ring_buffer_dump_and_load() -> None:
+    """A dumped buffer loads back; data of another size is ignored."""
+    buffer = RingBuffer(3)
+    buffer.append(1.0, sample(1))
+    restored = RingBuffer(3)
+    restored.load(buffer.dump())
+    assert (restored.head, restored.count) == (1, 1)
+    assert restored.timestamps[0] == 1.0
+
+    other = RingBuffer(4)
+    other.load(buffer.dump())
+    assert other.count == 0
+
+
+def test_rollup_averages_and_keeps_last_state() -> None:
+    """Buckets average the values, except the state which keeps its last value."""
+    tier = RollupTier(HISTORY_TIERS[1])
+    tier.add(0, sample(1))
+    tier.add(100, [3.0, math.nan, 3.0, 3.0, 3.0, 5.0])
+    start, values = tier.current()
+    assert start == 0
+    assert values == [2.0, 1.0, 2.0, 2.0, 2.0, 5.0]
+
+    tier.add(300, sample(7))
+    assert tier.buffer.count == 1
+    assert tier.current()[0] == 300
+
+
+def test_query_includes_open_bucket_after_restore() -> None:
+    """The open bucket is stored and returned as the last sample."""
+    history = StoveHistory()
+    history.record(0, AduroStatus(smoke_temp=100.0, state="5"))
+    history.record(20, AduroStatus(smoke_temp=110.0, state="5"))
+
+    restored = StoveHistory()
+    restored.load(history.dump())
+    assert restored.query("raw", 0, 60, ["smoke_temp", "state"]) == {
+        "resolution": "raw",
+        "timestamps": [0.0, 20.0],
+        "smoke_temp": [100.0, 110.0],
+        "state": [5.0, 5.0],
+    }
+    assert restored.query("hour", 0, 60, ["smoke_temp"])["smoke_temp"] == [105.0]
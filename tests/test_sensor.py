@@ -0,0 +1,35 @@
+"""Tests for the Aduro sensors."""
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.aduro.sensor import AduroIgnitionTimerSensor
+
+
+async def test_ignition_countdown_writes(hass: HomeAssistant) -> None:
+    """The countdown is written when it starts and ends, and not in between."""
+    coordinator = Mock(
+        stove_serial="123456",
+        last_update_success=True,
+        status=SimpleNamespace(state="2"),
+    )
+    sensor = AduroIgnitionTimerSensor(coordinator, "2", 870, "timer_startup_1", "Ignition 1")
+    sensor.hass = hass
+    sensor.async_write_ha_state = Mock()
+
+    with patch("custom_components.aduro.sensor.async_call_later") as call_later:
+        sensor._handle_coordinator_update()
+    assert sensor.native_value > dt_util.utcnow()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    call_later.call_args.args[2](dt_util.utcnow())
+    assert sensor.native_value is None
+    assert sensor.async_write_ha_state.call_count == 2
+
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
@@ -0,0 +1,251 @@
+"""Tests for the Aduro NBE transport."""
+import asyncio
+
+import pytest
+
+from custom_components.aduro.transport import (
+    FUNCTION_GET_STATUS,
+    FUNCTION_SET_SETTINGS,
+    AduroResponseError,
+    AduroTimeoutError,
+    AduroTransport,
+    AduroTransportError,
+    RetryBudget,
+    RetryPolicy,
+    async_retry,
+    build_request_frame,
+    normalize_serial,
+    parse_discovery_payload,
+    parse_operating_value,
+    parse_response_frame,
+)
+
+NO_DELAY = RetryPolicy(timeout=0.2, attempts=3, base_delay=0, max_delay=0)
+
+
+def response_frame(
+    payload: str,
+    function_id: int = FUNCTION_GET_STATUS,
+    sequence: int = 1,
+    status: int = 0,
+    serial: str = "012345",
+    start: str = "\x02",
+) -> bytes:
+    """Return a response frame as the stove sends it."""
+    return (
+        f"{'homeassistan'}{serial}{start}{function_id:02d}{sequence:02d}{status}"
+        f"{len(payload):03d}{payload}\x04"
+    ).encode("latin-1")
+
+
+def test_request_frame_layout() -> None:
+    """Requests are padded like pyduro's frames."""
+    frame = build_request_frame("12345", "1234", FUNCTION_GET_STATUS, 7, "*").decode(
+        "latin-1"
+    )
+    assert frame[:12] == "homeassistan"
+    assert frame[12:18] == "012345"
+    assert frame[19] == "\x02"
+    assert frame[20:22] == "11"
+    assert frame[22:24] == "07"
+    assert frame[24:34] == "1234000000"
+    assert frame[44:48] == "pad "
+    assert frame[48:51] == "001"
+    assert frame[51:] == "*\x04"
+
+
+def test_parse_response_frame() -> None:
+    """A response frame is split into its fields."""
+    response = parse_response_frame(response_frame("21.5,22,0", sequence=42, status=0))
+    assert response.serial == "012345"
+    assert response.function_id == FUNCTION_GET_STATUS
+    assert response.sequence == 42
+    assert response.status == 0
+    assert response.payload == "21.5,22,0"
+
+
+def test_parse_response_frame_without_frame_start() -> None:
+    """Like pyduro, the byte before the function is not checked."""
+    response = parse_response_frame(response_frame("state=5", start=" "))
+    assert response.payload == "state=5"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"short", response_frame("21.5,22,0")[:-6]],
+)
+def test_parse_malformed_frame(data: bytes) -> None:
+    """Short and truncated frames are rejected."""
+    with pytest.raises(ValueError):
+        parse_response_frame(data)
+
+
+def test_normalize_serial() -> None:
+    """Serials are left padded with zeros to six characters."""
+    assert normalize_serial("1234") == "001234"
+    assert normalize_serial("123456") == "123456"
+
+
+def test_parse_discovery_payload() -> None:
+    """Discovery replies are semicolon separated key=value pairs."""
+    assert parse_discovery_payload("Serial=012345;IP=192.168.1.20;Type=H2;junk") == {
+        "Serial": "012345",
+        "IP": "192.168.1.20",
+        "Type": "H2",
+    }
+
+
+def test_parse_operating_value() -> None:
+    """Single operating values are answered as name=value."""
+    assert parse_operating_value("state=5", "state") == "5"
+    assert parse_operating_value("substate=13 ", "substate") == "13"
+    assert parse_operating_value("substate=13", "state") is None
+    assert parse_operating_value("5", "state") is None
+
+
+def test_retry_delay_is_bounded() -> None:
+    """Retry delays grow exponentially up to the maximum, with jitter."""
+    policy = RetryPolicy(base_delay=0.25, max_delay=2.0)
+    for retry, delay in ((1, 0.25), (2, 0.5), (3, 1.0), (6, 2.0)):
+        for _ in range(20):
+            assert delay / 2 <= policy.delay(retry) <= delay
+
+
+def test_retry_budget() -> None:
+    """A budget hands out a fixed number of retries."""
+    budget = RetryBudget(2)
+    assert [budget.take() for _ in range(3)] == [True, True, False]
+
+
+async def test_retry_until_success() -> None:
+    """Failed attempts are retried with the timeout of the policy."""
+    calls = []
+
+    async def request(attempt: int, timeout: float) -> str:
+        calls.append((attempt, timeout))
+        if attempt < 2:
+            raise AduroTimeoutError("no answer")
+        return "ok"
+
+    assert await async_retry(request, NO_DELAY) == "ok"
+    assert calls == [(0, 0.2), (1, 0.2), (2, 0.2)]
+
+
+async def test_retry_stops_at_attempts_and_budget() -> None:
+    """Retries end after the last attempt or when the budget is used up."""
+    calls = 0
+
+    async def request(attempt: int, timeout: float) -> str:
+        nonlocal calls
+        calls += 1
+        raise AduroTimeoutError("no answer")
+
+    with pytest.raises(AduroTimeoutError):
+        await async_retry(request, NO_DELAY)
+    assert calls == 3
+
+    calls = 0
+    budget = RetryBudget(1)
+    with pytest.raises(AduroTimeoutError):
+        await async_retry(request, NO_DELAY, budget)
+    assert calls == 2
+    assert budget.remaining == 0
+
+
+async def test_rejected_requests_are_not_retried() -> None:
+    """The stove rejecting a request is final."""
+    calls = 0
+
+    async def request(attempt: int, timeout: float) -> str:
+        nonlocal calls
+        calls += 1
+        raise AduroResponseError("rejected")
+
+    with pytest.raises(AduroResponseError):
+        await async_retry(request, NO_DELAY)
+    assert calls == 1
+
+
+class FakeStove(asyncio.DatagramProtocol):
+    """Answer request frames with a fixed payload and status."""
+
+    def __init__(self, payload: str, status: int = 0) -> None:
+        """Initialize the stove."""
+        self.payload = payload
+        self.status = status
+        self.transport = None
+        self.requests = []
+
+    def connection_made(self, transport) -> None:
+        """Store the transport."""
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        """Reply to a request frame."""
+        frame = data.decode("latin-1")
+        self.requests.append(frame)
+        self.transport.sendto(
+            response_frame(
+                self.payload,
+                function_id=int(frame[20:22]),
+                sequence=int(frame[22:24]),
+                status=self.status,
+                serial=frame[12:18],
+            ),
+            addr,
+        )
+
+
+async def start_stove(payload: str, status: int = 0) -> tuple[FakeStove, int]:
+    """Start a fake stove on a free local port."""
+    loop = asyncio.get_running_loop()
+    transport, stove = await loop.create_datagram_endpoint(
+        lambda: FakeStove(payload, status), local_addr=("127.0.0.1", 0)
+    )
+    return stove, transport.get_extra_info("sockname")[1]
+
+
+async def test_request_round_trip(socket_enabled: None) -> None:
+    """A request is answered over the shared socket."""
+    stove, port = await start_stove("21.5,22,0")
+    transport = AduroTransport(port=port)
+    try:
+        response = await transport.async_request(
+            "127.0.0.1", "12345", "1234", FUNCTION_GET_STATUS, "*", 1.0
+        )
+    finally:
+        await transport.async_close()
+        stove.transport.close()
+    assert response.payload == "21.5,22,0"
+    assert stove.requests[0][12:18] == "012345"
+
+
+async def test_rejected_request(socket_enabled: None) -> None:
+    """A non-zero status raises AduroResponseError."""
+    stove, port = await start_stove("", status=1)
+    transport = AduroTransport(port=port)
+    try:
+        with pytest.raises(AduroResponseError):
+            await transport.async_request(
+                "127.0.0.1", "12345", "1234", FUNCTION_SET_SETTINGS, "boiler.temp=21", 1.0
+            )
+    finally:
+        await transport.async_close()
+        stove.transport.close()
+
+
+async def test_request_timeout(socket_enabled: None) -> None:
+    """A request nobody answers times out."""
+    loop = asyncio.get_running_loop()
+    silent, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, local_addr=("127.0.0.1", 0)
+    )
+    transport = AduroTransport(port=silent.get_extra_info("sockname")[1])
+    try:
+        with pytest.raises(AduroTransportError):
+            await transport.async_request(
+                "127.0.0.1", "12345", "1234", FUNCTION_GET_STATUS, "*", 0.1
+            )
+    finally:
+        await transport.async_close()
+        silent.close()